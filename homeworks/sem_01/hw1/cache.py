@@ -1,18 +1,793 @@
+import asyncio
+import hashlib
+import mmap
+import os
+import pickle
+import struct
+import sys
+import zlib
+
+from functools import partial, wraps
+from inspect import iscoroutinefunction
+from numbers import Real
+from threading import Lock
+from time import monotonic, time
 from typing import (
+    Any,
+    Awaitable,
     Callable,
+    Hashable,
+    NamedTuple,
+    Optional,
     TypeVar,
 )
 
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
 
 T = TypeVar("T")
 
+_MISSING = object()
+_KWARGS_MARK = object()
+
+
+class CacheInfo(NamedTuple):
+    """
+    Статистика использования кеша.
+
+    Attrs:
+        hits: число обращений, для которых результат был найден в кеше.
+        misses: число обращений, потребовавших вызова функции.
+        evictions: число записей, вытесненных из кеша.
+        capacity: максимальный возможный размер кеша.
+        currsize: текущее число записей в кеше.
+        expirations: число записей, удаленных по истечении срока жизни.
+        currbytes: суммарный размер записей в байтах; учитывается,
+            только если задан бюджет памяти.
+        disk_hits: число обращений, для которых результат был найден
+            на диске.
+    """
+    hits: int
+    misses: int
+    evictions: int
+    capacity: int
+    currsize: int
+    expirations: int
+    currbytes: int
+    disk_hits: int
+
+
+def default_sizeof(value: Any) -> int:
+    """
+    Оценивает размер значения в байтах.
+
+    Для объектов с атрибутом nbytes (например, массивов NumPy) учитывается
+    размер буфера с данными, для остальных используется sys.getsizeof.
+
+    Args:
+        value: значение, размер которого необходимо оценить.
+
+    Returns:
+        Размер значения в байтах.
+    """
+    nbytes = getattr(value, "nbytes", None)
+
+    if isinstance(nbytes, int):
+        return nbytes
+
+    return sys.getsizeof(value)
+
+
+class _Node:
+    """
+    Запись кеша.
+
+    Узел одновременно входит в два двусвязных списка: список LRU
+    (prev/next) и список истечения срока жизни (exp_prev/exp_next).
+    """
+
+    __slots__ = (
+        "key",
+        "value",
+        "size",
+        "expires_at",
+        "prev",
+        "next",
+        "exp_prev",
+        "exp_next",
+    )
+
+    def __init__(self, key: Hashable = None, value: Any = None, size: int = 0) -> None:
+        self.key = key
+        self.value = value
+        self.size = size
+        self.expires_at = 0.0
+        self.prev: "_Node" = self
+        self.next: "_Node" = self
+        self.exp_prev: "_Node" = self
+        self.exp_next: "_Node" = self
+
+
+class _LRUSegment:
+    """
+    Независимый сегмент LRU-кеша со своей блокировкой.
+
+    Записи хранятся в словаре, ссылающемся на узлы двусвязного списка.
+    Голова списка - наименее давно использованная запись, хвост - наиболее
+    свежая, поэтому поиск, вставка и вытеснение выполняются за O(1).
+
+    Если задано время жизни записей, узлы дополнительно упорядочены
+    по моменту истечения. Просроченная запись удаляется при обращении к ней,
+    а каждая вставка проверяет не более _SWEEP_LIMIT записей из головы
+    списка истечения, поэтому полный просмотр кеша никогда не выполняется.
+    """
+
+    _SWEEP_LIMIT = 2
+
+    def __init__(
+        self,
+        capacity: int,
+        max_bytes: Optional[int] = None,
+        ttl: Optional[float] = None,
+        sizeof: Callable[[Any], int] = default_sizeof,
+    ) -> None:
+        self._capacity = capacity
+        self._max_bytes = max_bytes
+        self._ttl = ttl
+        self._sizeof = sizeof
+        self._nodes: dict[Hashable, _Node] = {}
+        self._root = _Node()
+        self._lock = Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.currbytes = 0
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def get(self, key: Hashable) -> Any:
+        """
+        Возвращает значение по ключу и помечает запись как использованную.
+
+        Args:
+            key: ключ записи.
+
+        Returns:
+            Сохраненное значение или _MISSING, если записи нет в кеше
+            или срок ее жизни истек.
+        """
+        with self._lock:
+            node = self._nodes.get(key)
+
+            if node is not None and self._ttl is not None and node.expires_at <= monotonic():
+                self._remove(node)
+                self.expirations += 1
+                node = None
+
+            if node is None:
+                self.misses += 1
+                return _MISSING
+
+            self._unlink(node)
+            self._append(node)
+            self.hits += 1
+
+            return node.value
+
+    def put(self, key: Hashable, value: Any) -> list[_Node]:
+        """
+        Сохраняет значение в кеш, вытесняя наименее давно использованные записи.
+
+        Значение, размер которого сам по себе превышает бюджет памяти,
+        в кеш не попадает.
+
+        Args:
+            key: ключ записи.
+            value: сохраняемое значение.
+
+        Returns:
+            Список вытесненных записей. Записи, удаленные по истечении
+            срока жизни, в него не входят.
+        """
+        size = self._sizeof(value) if self._max_bytes is not None else 0
+        evicted = []
+
+        with self._lock:
+            if self._ttl is not None:
+                self._sweep()
+
+            node = self._nodes.get(key)
+
+            if node is not None:
+                self._remove(node)
+
+            node = _Node(key, value, size)
+
+            if self._max_bytes is not None and size > self._max_bytes:
+                node.expires_at = monotonic() + (self._ttl or 0.0)
+                return [node]
+
+            self._insert(node)
+
+            while self._is_overflowed():
+                evicted.append(self._evict())
+
+        return evicted
+
+    def clear(self) -> None:
+        """Очищает сегмент и сбрасывает статистику."""
+        with self._lock:
+            self._nodes.clear()
+            self._root.prev = self._root.next = self._root
+            self._root.exp_prev = self._root.exp_next = self._root
+            self.hits = self.misses = self.evictions = self.expirations = 0
+            self.currbytes = 0
+
+    def _is_overflowed(self) -> bool:
+        if len(self._nodes) > self._capacity:
+            return True
+
+        return self._max_bytes is not None and self.currbytes > self._max_bytes
+
+    def _sweep(self) -> None:
+        now = monotonic()
+
+        for _ in range(self._SWEEP_LIMIT):
+            oldest = self._root.exp_next
+
+            if oldest is self._root or oldest.expires_at > now:
+                return
+
+            self._remove(oldest)
+            self.expirations += 1
+
+    def _evict(self) -> _Node:
+        oldest = self._root.next
+        self._remove(oldest)
+        self.evictions += 1
+
+        return oldest
+
+    def _insert(self, node: _Node) -> None:
+        self._nodes[node.key] = node
+        self._append(node)
+        self.currbytes += node.size
+
+        if self._ttl is not None:
+            node.expires_at = monotonic() + self._ttl
+            last = self._root.exp_prev
+            last.exp_next = node
+            node.exp_prev = last
+            node.exp_next = self._root
+            self._root.exp_prev = node
+
+    def _remove(self, node: _Node) -> None:
+        del self._nodes[node.key]
+        self._unlink(node)
+        self.currbytes -= node.size
+
+        if self._ttl is not None:
+            node.exp_prev.exp_next = node.exp_next
+            node.exp_next.exp_prev = node.exp_prev
+
+    def _append(self, node: _Node) -> None:
+        last = self._root.prev
+        last.next = node
+        node.prev = last
+        node.next = self._root
+        self._root.prev = node
+
+    @staticmethod
+    def _unlink(node: _Node) -> None:
+        node.prev.next = node.next
+        node.next.prev = node.prev
+
+
+class DiskTier:
+    """
+    Второй уровень кеша: журнал записей на диске, читаемый через mmap.
+
+    Записи только дописываются в конец файла, каждая запись состоит из
+    заголовка (дайджест ключа, длина данных, контрольная сумма, момент
+    истечения срока жизни) и сериализованного pickle значения. В памяти
+    хранится только индекс "дайджест -> (смещение, длина)", поэтому
+    значения читаются с диска лишь при обращении к ним.
+
+    Дайджест вычисляется по сериализованному ключу и пространству имен,
+    а не через hash(), поэтому журналом могут пользоваться разные процессы
+    и перезапущенный процесс. Запись выполняется под эксклюзивной файловой
+    блокировкой, а при промахе индекс дочитывается с того места, на котором
+    он был построен, чтобы увидеть записи соседних процессов.
+
+    Журнал не сжимается: при повторной записи ключа действует последняя
+    запись, а удалить журнал можно, когда его не использует ни один процесс.
+    Недописанная запись в конце журнала (процесс-писатель упал во время
+    записи) не индексируется и отрезается перед следующей записью.
+    """
+
+    _HEADER = struct.Struct("<16sQId")
+
+    def __init__(self, path: str, namespace: str = "") -> None:
+        """
+        Открывает журнал, создавая его при необходимости.
+
+        Args:
+            path: путь к файлу журнала.
+            namespace: пространство имен ключей, позволяющее нескольким
+                функциям использовать один журнал.
+        """
+        self._namespace = namespace
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_APPEND, 0o644)
+        self._map: Optional[mmap.mmap] = None
+        self._index: dict[bytes, tuple[int, int]] = {}
+        self._indexed_size = 0
+        self._lock = Lock()
+
+        self.hits = 0
+
+        with self._lock:
+            self._refresh()
+
+    def get(self, key: Hashable) -> Any:
+        """
+        Читает значение из журнала.
+
+        Args:
+            key: ключ записи.
+
+        Returns:
+            Сохраненное значение или _MISSING, если записи нет, она повреждена
+            или срок ее жизни истек.
+        """
+        digest = self._digest(key)
+
+        if digest is None:
+            return _MISSING
+
+        with self._lock:
+            location = self._index.get(digest)
+
+            if location is None:
+                self._refresh()
+                location = self._index.get(digest)
+
+            if location is None:
+                return _MISSING
+
+            value = self._read(*location)
+
+            if value is not _MISSING:
+                self.hits += 1
+
+            return value
+
+    def put(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Дописывает значение в журнал.
+
+        Ключи и значения, которые невозможно сериализовать, пропускаются.
+        Бессрочное значение не записывается повторно, если ключ уже
+        есть в журнале.
+
+        Args:
+            key: ключ записи.
+            value: сохраняемое значение.
+            ttl: оставшееся время жизни записи в секундах. Значение
+                по умолчанию - None, запись не устаревает.
+        """
+        digest = self._digest(key)
+
+        if digest is None or (ttl is None and digest in self._index):
+            return
+
+        try:
+            payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            return
+
+        expires_at = 0.0 if ttl is None else time() + ttl
+        header = self._HEADER.pack(digest, len(payload), zlib.crc32(payload), expires_at)
+
+        with self._lock:
+            _lock_file(self._fd, exclusive=True)
+
+            try:
+                if self._scan() > self._indexed_size:
+                    # иначе запись окажется за оборванной и не будет прочитана
+                    os.ftruncate(self._fd, self._indexed_size)
+
+                os.write(self._fd, header + payload)
+                self._scan()
+            finally:
+                _unlock_file(self._fd)
+
+    def close(self) -> None:
+        """Закрывает журнал. Повторный вызов ничего не делает."""
+        with self._lock:
+            if self._map is not None:
+                self._map.close()
+                self._map = None
+
+            if self._fd >= 0:
+                os.close(self._fd)
+                self._fd = -1
+
+    def _digest(self, key: Hashable) -> Optional[bytes]:
+        try:
+            data = pickle.dumps((self._namespace, key), protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            return None
+
+        return hashlib.blake2b(data, digest_size=16).digest()
+
+    def _refresh(self) -> None:
+        _lock_file(self._fd, exclusive=False)
+
+        try:
+            self._scan()
+        finally:
+            _unlock_file(self._fd)
+
+    def _scan(self) -> int:
+        """
+        Дочитывает индекс до конца журнала или до недописанной записи.
+
+        Вызывается под файловой блокировкой.
+
+        Returns:
+            Размер файла журнала.
+        """
+        size = os.fstat(self._fd).st_size
+        offset = self._indexed_size
+
+        while offset + self._HEADER.size <= size:
+            header = os.pread(self._fd, self._HEADER.size, offset)
+            digest, length, _, _ = self._HEADER.unpack(header)
+            end = offset + self._HEADER.size + length
+
+            if end > size:
+                break
+
+            self._index[digest] = (offset, length)
+            offset = end
 
-def lru_cache(capacity: int) -> Callable[[T], T]:
+        self._indexed_size = offset
+
+        return size
+
+    def _read(self, offset: int, length: int) -> Any:
+        end = offset + self._HEADER.size + length
+
+        if self._map is None or len(self._map) < end:
+            if self._map is not None:
+                self._map.close()
+
+            self._map = mmap.mmap(self._fd, self._indexed_size, access=mmap.ACCESS_READ)
+
+        _, _, checksum, expires_at = self._HEADER.unpack_from(self._map, offset)
+        payload = self._map[offset + self._HEADER.size:end]
+
+        if zlib.crc32(payload) != checksum or (expires_at and expires_at <= time()):
+            return _MISSING
+
+        try:
+            return pickle.loads(payload)
+        except Exception:
+            return _MISSING
+
+
+def _lock_file(fd: int, exclusive: bool) -> None:
+    """Захватывает файловую блокировку, если платформа ее поддерживает."""
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+
+
+def _unlock_file(fd: int) -> None:
+    """Освобождает файловую блокировку."""
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+class _LRUStorage:
+    """
+    Хранилище LRU-кеша, разделенное на сегменты.
+
+    Ключ попадает в сегмент по своему хешу, поэтому потоки, работающие
+    с разными сегментами, не конкурируют за одну блокировку. Порядок
+    вытеснения соблюдается внутри каждого сегмента, емкость и бюджет
+    памяти делятся между сегментами поровну.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        stripes: int,
+        max_bytes: Optional[int] = None,
+        ttl: Optional[float] = None,
+        sizeof: Callable[[Any], int] = default_sizeof,
+        disk: Optional["DiskTier"] = None,
+    ) -> None:
+        stripes = min(stripes, capacity)
+        base, extra = divmod(capacity, stripes)
+        segment_bytes = None if max_bytes is None else max(1, max_bytes // stripes)
+
+        self._capacity = capacity
+        self._ttl = ttl
+        self._disk = disk
+        self._segments = [
+            _LRUSegment(base + (1 if i < extra else 0), segment_bytes, ttl, sizeof)
+            for i in range(stripes)
+        ]
+
+    def segment(self, key: Hashable) -> _LRUSegment:
+        """Возвращает сегмент, отвечающий за ключ key."""
+        if len(self._segments) == 1:
+            return self._segments[0]
+
+        return self._segments[hash(key) % len(self._segments)]
+
+    def get(self, key: Hashable) -> Any:
+        """
+        Ищет значение в памяти, а затем на диске.
+
+        Значение, найденное на диске, возвращается в память.
+
+        Args:
+            key: ключ записи.
+
+        Returns:
+            Сохраненное значение или _MISSING, если его нет ни в одном уровне.
+        """
+        segment = self.segment(key)
+        value = segment.get(key)
+
+        if value is _MISSING and self._disk is not None:
+            value = self._disk.get(key)
+
+            if value is not _MISSING:
+                self._spill(segment.put(key, value))
+
+        return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        Сохраняет значение в память, перенося вытесненные записи на диск.
+
+        Args:
+            key: ключ записи.
+            value: сохраняемое значение.
+        """
+        self._spill(self.segment(key).put(key, value))
+
+    def _spill(self, evicted: list[_Node]) -> None:
+        if self._disk is None:
+            return
+
+        for node in evicted:
+            ttl = None if self._ttl is None else node.expires_at - monotonic()
+
+            if ttl is None or ttl > 0:
+                self._disk.put(node.key, node.value, ttl)
+
+    def info(self) -> CacheInfo:
+        """Собирает статистику по всем сегментам."""
+        return CacheInfo(
+            hits=sum(segment.hits for segment in self._segments),
+            misses=sum(segment.misses for segment in self._segments),
+            evictions=sum(segment.evictions for segment in self._segments),
+            capacity=self._capacity,
+            currsize=sum(len(segment) for segment in self._segments),
+            expirations=sum(segment.expirations for segment in self._segments),
+            currbytes=sum(segment.currbytes for segment in self._segments),
+            disk_hits=0 if self._disk is None else self._disk.hits,
+        )
+
+    def clear(self) -> None:
+        """Очищает все сегменты."""
+        for segment in self._segments:
+            segment.clear()
+
+    def close(self) -> None:
+        """Очищает память и закрывает журнал на диске, отключая второй уровень."""
+        self.clear()
+
+        if self._disk is not None:
+            disk, self._disk = self._disk, None
+            disk.close()
+
+
+def _make_key(args: tuple, kwargs: dict) -> Hashable:
+    """
+    Строит хешируемый ключ по аргументам вызова функции.
+
+    Args:
+        args: позиционные аргументы вызова.
+        kwargs: именованные аргументы вызова.
+
+    Returns:
+        Ключ, одинаковый для одинаковых наборов аргументов.
+    """
+    if not kwargs:
+        return args[0] if len(args) == 1 and type(args[0]) in {int, str} else args
+
+    return args + (_KWARGS_MARK,) + tuple(sorted(kwargs.items()))
+
+
+def _to_positive_int(value: Any, name: str) -> int:
+    """
+    Округляет value и проверяет, что результат - натуральное число.
+
+    Args:
+        value: объект, совместимый с вызовом round().
+        name: имя параметра для сообщений об ошибках.
+
+    Returns:
+        Округленное значение.
+
+    Raises:
+        TypeError, если value не может быть округлено.
+        ValueError, если после округления value меньше 1.
+    """
+    try:
+        value = int(round(value))
+    except (TypeError, ValueError, OverflowError) as exc:
+        raise TypeError(f"{name} must be compatible with round(), got {value!r}") from exc
+
+    if value < 1:
+        raise ValueError(f"{name} must be greater than or equal to 1, got {value}")
+
+    return value
+
+
+def _to_positive_float(value: Any, name: str) -> float:
+    """
+    Проверяет, что value - положительное вещественное число.
+
+    Args:
+        value: проверяемое значение.
+        name: имя параметра для сообщений об ошибках.
+
+    Returns:
+        Значение, приведенное к float.
+
+    Raises:
+        TypeError, если value не является числом.
+        ValueError, если value не положительно.
+    """
+    if not isinstance(value, Real):
+        raise TypeError(f"{name} must be a real number, got {value!r}")
+
+    if not value > 0:
+        raise ValueError(f"{name} must be positive, got {value}")
+
+    return float(value)
+
+
+def _make_sync_wrapper(func: Callable[..., T], storage: _LRUStorage) -> Callable[..., T]:
+    """
+    Оборачивает обычную функцию в кеширующую обертку.
+
+    Args:
+        func: кешируемая функция.
+        storage: хранилище кеша.
+
+    Returns:
+        Обертка над func.
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs) -> T:
+        key = _make_key(args, kwargs)
+        result = storage.get(key)
+
+        if result is _MISSING:
+            result = func(*args, **kwargs)
+            storage.put(key, result)
+
+        return result
+
+    return wrapper
+
+
+def _make_async_wrapper(
+    func: Callable[..., Awaitable[T]],
+    storage: _LRUStorage,
+) -> Callable[..., Awaitable[T]]:
+    """
+    Оборачивает корутинную функцию в кеширующую обертку.
+
+    Одновременные промахи по одному ключу объединяются: вычисление
+    запускается единожды в виде задачи, а все ожидающие получают ее
+    результат. Отмена одного из ожидающих не отменяет общую задачу.
+    Результат сохраняется в кеш только при успешном завершении,
+    исключения не кешируются.
+
+    Args:
+        func: кешируемая корутинная функция.
+        storage: хранилище кеша.
+
+    Returns:
+        Обертка над func.
+    """
+    in_flight: dict[Hashable, asyncio.Task] = {}
+
+    def on_done(key: Hashable, task: asyncio.Task) -> None:
+        if in_flight.get(key) is task:
+            del in_flight[key]
+
+        if not task.cancelled() and task.exception() is None:
+            storage.put(key, task.result())
+
+    @wraps(func)
+    async def wrapper(*args, **kwargs) -> T:
+        key = _make_key(args, kwargs)
+        result = storage.get(key)
+
+        if result is not _MISSING:
+            return result
+
+        task = in_flight.get(key)
+
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.ensure_future(func(*args, **kwargs))
+            task.add_done_callback(partial(on_done, key))
+            in_flight[key] = task
+
+        return await asyncio.shield(task)
+
+    return wrapper
+
+
+def lru_cache(
+    capacity: int,
+    *,
+    stripes: int = 1,
+    max_bytes: Optional[int] = None,
+    ttl: Optional[float] = None,
+    sizeof: Callable[[Any], int] = default_sizeof,
+    disk_path: Optional[str] = None,
+) -> Callable[[Callable[..., T]], Callable[..., T]]:
     """
     Параметризованный декоратор для реализации LRU-кеширования.
 
+    Декорированная функция получает методы cache_info(), cache_clear()
+    и cache_close().
+    При stripes > 1 кеш делится на независимые сегменты со своими
+    блокировками, что снижает конкуренцию потоков; емкость при этом
+    распределяется между сегментами, а порядок LRU соблюдается внутри
+    каждого сегмента.
+
+    Если декорируемая функция - корутинная, одновременные вызовы с одинаковыми
+    аргументами разделяют одно вычисление, а исключения не кешируются.
+
+    Помимо числа записей, размер кеша можно ограничить бюджетом памяти
+    max_bytes: размер каждого значения оценивается функцией sizeof, и
+    при превышении бюджета вытесняются наименее давно использованные записи.
+    Если задан ttl, запись считается недействительной через ttl секунд
+    после сохранения.
+
+    Если задан disk_path, вытесненные из памяти записи переносятся
+    в журнал на диске (см. DiskTier) и при промахе в памяти ищутся там.
+    Журнал переживает перезапуск процесса и может использоваться
+    соседними процессами. cache_clear() очищает только память, а
+    cache_close() очищает память и закрывает журнал (mmap и файловый
+    дескриптор); после этого кеш продолжает работать только в памяти.
+
     Args:
         capacity: целое число, максимальный возможный размер кеша.
+        stripes: число сегментов кеша. Значение по умолчанию - 1.
+        max_bytes: максимальный суммарный размер значений в байтах.
+            Значение по умолчанию - None, ограничения нет.
+        ttl: время жизни записи в секундах. Значение по умолчанию - None,
+            записи не устаревают.
+        sizeof: функция оценки размера значения в байтах.
+        disk_path: путь к журналу второго уровня кеша. Значение по умолчанию -
+            None, второй уровень не используется.
 
     Returns:
         Декоратор для непосредственного использования.
@@ -21,6 +796,35 @@ def lru_cache(capacity: int) -> Callable[[T], T]:
         TypeError, если capacity не может быть округлено и использовано
             для получения целого числа.
         ValueError, если после округления capacity - число, меньшее 1.
+        TypeError, если ttl не является числом.
+        ValueError, если ttl не положительно.
     """
-    # ваш код
-    pass
+    capacity = _to_positive_int(capacity, "capacity")
+    stripes = _to_positive_int(stripes, "stripes")
+
+    if max_bytes is not None:
+        max_bytes = _to_positive_int(max_bytes, "max_bytes")
+
+    if ttl is not None:
+        ttl = _to_positive_float(ttl, "ttl")
+
+    def decorator(func: Callable[..., T]) -> Callable[..., T]:
+        disk = None
+
+        if disk_path is not None:
+            disk = DiskTier(disk_path, f"{func.__module__}.{func.__qualname__}")
+
+        storage = _LRUStorage(capacity, stripes, max_bytes, ttl, sizeof, disk)
+
+        if iscoroutinefunction(func):
+            wrapper = _make_async_wrapper(func, storage)
+        else:
+            wrapper = _make_sync_wrapper(func, storage)
+
+        wrapper.cache_info = storage.info
+        wrapper.cache_clear = storage.clear
+        wrapper.cache_close = storage.close
+
+        return wrapper
+
+    return decorator
@@ -1,43 +1,496 @@
+import math
+import mmap
+import struct
+
+from collections import deque
+from typing import Optional, Sequence, Union
 from uuid import UUID
-from typing import Sequence
+
+import numpy as np
+
+
+_MASK_64 = np.uint64(0xFFFFFFFFFFFFFFFF)
+_UUID_DTYPE = np.dtype("V16")
+
+UsersBatch = Union[Sequence[UUID], np.ndarray, bytes, bytearray, memoryview, mmap.mmap]
+
+
+def _mix64(values: np.ndarray) -> np.ndarray:
+    """
+    Перемешивает биты 64-битных беззнаковых чисел (финализатор splitmix64).
+
+    Args:
+        values: массив uint64.
+
+    Returns:
+        Массив uint64 с равномерно распределенными битами.
+    """
+    values = values ^ (values >> np.uint64(30))
+    values = values * np.uint64(0xBF58476D1CE4E5B9)
+    values = values ^ (values >> np.uint64(27))
+    values = values * np.uint64(0x94D049BB133111EB)
+
+    return (values ^ (values >> np.uint64(31))) & _MASK_64
+
+
+def _to_uuid_array(users: UsersBatch) -> np.ndarray:
+    """
+    Упаковывает UUID в компактный массив 16-байтовых значений.
+
+    Буферы (bytes, memoryview, mmap и т.п.) и массивы NumPy с типом V16
+    не копируются: результат ссылается на их память.
+
+    Args:
+        users: последовательность UUID, массив NumPy формы (n, 16) с типом uint8
+            или формы (n,) с типом V16, либо буфер из подряд идущих 16-байтовых UUID.
+
+    Returns:
+        Одномерный массив с типом V16, содержащий байты UUID в порядке big-endian.
+
+    Raises:
+        ValueError, если размер буфера не кратен 16 байтам или массив
+            имеет неподходящие форму или тип.
+    """
+    if isinstance(users, np.ndarray):
+        return _from_ndarray(users)
+
+    if isinstance(users, (bytes, bytearray, memoryview, mmap.mmap)):
+        if memoryview(users).nbytes % _UUID_DTYPE.itemsize:
+            raise ValueError(
+                f"buffer size must be a multiple of {_UUID_DTYPE.itemsize} bytes"
+            )
+
+        return np.frombuffer(users, dtype=_UUID_DTYPE)
+
+    return np.frombuffer(b"".join(user.bytes for user in users), dtype=_UUID_DTYPE)
+
+
+def _from_ndarray(users: np.ndarray) -> np.ndarray:
+    if users.dtype == _UUID_DTYPE and users.ndim == 1:
+        # срез с шагом (arr[::2]) не может быть представлен как uint64 без копии
+        return np.ascontiguousarray(users)
+
+    if users.dtype == np.uint8 and users.ndim == 2 and users.shape[1] == _UUID_DTYPE.itemsize:
+        return np.ascontiguousarray(users).view(_UUID_DTYPE).ravel()
+
+    raise ValueError(
+        f"expected array of shape (n, 16) with dtype uint8 or shape (n,) with dtype V16, "
+        f"got shape {users.shape} with dtype {users.dtype}"
+    )
+
+
+def _to_ints(uuids: np.ndarray) -> list[int]:
+    """
+    Преобразует массив 16-байтовых UUID в список 128-битных целых чисел.
+
+    Args:
+        uuids: массив с типом V16.
+
+    Returns:
+        Список целых чисел, совпадающих с UUID.int.
+    """
+    halves = uuids.view(">u8").reshape(-1, 2)
+
+    return [
+        (high << 64) | low
+        for high, low in zip(halves[:, 0].tolist(), halves[:, 1].tolist())
+    ]
+
+
+def _hash_uuids(uuids: np.ndarray) -> np.ndarray:
+    """
+    Вычисляет 64-битные хеши UUID.
+
+    Args:
+        uuids: массив с типом V16.
+
+    Returns:
+        Массив uint64 с хешами.
+    """
+    halves = uuids.view(">u8").reshape(-1, 2).astype(np.uint64)
+
+    return _mix64(halves[:, 0] ^ _mix64(halves[:, 1]))
+
+
+def _bit_length(values: np.ndarray) -> np.ndarray:
+    """
+    Вычисляет число значащих битов 64-битных чисел.
+
+    Половины по 32 бита представимы в float64 точно, поэтому показатель
+    степени np.frexp равен их битовой длине без ошибок округления.
+
+    Args:
+        values: массив uint64.
+
+    Returns:
+        Массив int с битовыми длинами, для нуля - 0.
+    """
+    high = (values >> np.uint64(32)).astype(np.float64)
+    low = (values & np.uint64(0xFFFFFFFF)).astype(np.float64)
+
+    return np.where(high > 0, 32 + np.frexp(high)[1], np.frexp(low)[1])
+
+
+class _HyperLogLogRing:
+    """
+    Кольцевой буфер дневных скетчей HyperLogLog.
+
+    Каждый день представлен массивом из 2 ** precision регистров. Оценка
+    за период строится по поэлементному максимуму регистров всех дней,
+    который пересчитывается только после добавления нового дня.
+    """
+
+    def __init__(self, period: int, precision: int) -> None:
+        self._precision = precision
+        self._registers = np.zeros((period, 1 << precision), dtype=np.uint8)
+        self._cursor = period - 1
+        self._estimate: Optional[int] = 0
+
+    def add_day(self, hashes: np.ndarray) -> None:
+        """
+        Начинает новый день, вытесняя самый старый, и добавляет в него хеши.
+
+        Args:
+            hashes: массив uint64 с хешами пользователей за день.
+        """
+        self._cursor = (self._cursor + 1) % len(self._registers)
+        day = self._registers[self._cursor]
+        day.fill(0)
+        self._estimate = None
+
+        if not hashes.size:
+            return
+
+        bits = 64 - self._precision
+        indices = (hashes >> np.uint64(bits)).astype(np.intp)
+        rest = hashes & np.uint64((1 << bits) - 1)
+
+        # ранг - позиция старшей единицы в оставшихся битах, считая слева;
+        # для нулевого остатка - bits + 1
+        ranks = (bits + 1 - _bit_length(rest)).astype(np.uint8)
+
+        np.maximum.at(day, indices, ranks)
+
+    @classmethod
+    def from_days(cls, days: np.ndarray) -> "_HyperLogLogRing":
+        """
+        Восстанавливает буфер по регистрам дней.
+
+        Args:
+            days: массив uint8 формы (period, 2 ** precision), дни упорядочены
+                от самого старого к самому новому.
+
+        Returns:
+            Кольцевой буфер, в котором последний день - текущий.
+        """
+        ring = cls(days.shape[0], days.shape[1].bit_length() - 1)
+        ring._registers[:] = days
+        ring._estimate = None
+
+        return ring
+
+    @property
+    def days(self) -> np.ndarray:
+        """Регистры дней, упорядоченные от самого старого к самому новому."""
+        return np.roll(self._registers, -(self._cursor + 1), axis=0)
+
+    @property
+    def precision(self) -> int:
+        """Логарифм числа регистров в скетче одного дня."""
+        return self._precision
+
+    @property
+    def estimate(self) -> int:
+        """Оценка числа уникальных элементов за весь период."""
+        if self._estimate is None:
+            self._estimate = self._count(self._registers.max(axis=0))
+
+        return self._estimate
+
+    @staticmethod
+    def _count(registers: np.ndarray) -> int:
+        size = registers.size
+        alpha = 0.7213 / (1 + 1.079 / size)
+        raw = alpha * size * size / np.ldexp(1.0, -registers.astype(np.int32)).sum()
+        zeros = int(np.count_nonzero(registers == 0))
+
+        if raw <= 2.5 * size and zeros:
+            return round(size * math.log(size / zeros))
+
+        return round(raw)
 
 
 class PeriodActiveUsers:
-    def __init__(self, accumulation_period: int) -> None:
+    # Диапазон точности скетчей: 2 ** 4 - 2 ** 18 регистров на день
+    _PRECISION_BOUNDS = (4, 18)
+    # Заголовок снимка: сигнатура, режим, период, точность, число дней
+    _SNAPSHOT_HEADER = struct.Struct("<4s?IBI")
+    _SNAPSHOT_MAGIC = b"PAU1"
+
+    def __init__(
+        self,
+        accumulation_period: int,
+        approximate: bool = False,
+        error_rate: float = 0.01,
+    ) -> None:
         """
         Инициализирует объект для подсчета числа уникальных пользователей.
 
+        В точном режиме для каждого дня хранится массив уникальных UUID
+        в виде 128-битных значений, а для каждого пользователя из окна -
+        число дней, в которые он был активен. Добавление дня требует времени,
+        пропорционального числу пользователей за этот день, а число уникальных
+        пользователей за период вычисляется за O(1).
+
+        В приближенном режиме для каждого дня хранится скетч HyperLogLog,
+        поэтому память не зависит от числа пользователей. Число регистров
+        скетча подбирается так, чтобы стандартная относительная ошибка
+        оценки не превышала error_rate.
+
         Args:
             accumulation_period: период времени, для которого необходимо подсчитать
                 число уникальных пользователей.
+            approximate: использовать ли приближенный подсчет. Значение
+                по умолчанию - False.
+            error_rate: допустимая стандартная относительная ошибка приближенного
+                подсчета. Значение по умолчанию - 0.01.
 
         Raises:
             TypeError, если accumulation_period не может быть округлено и использовано
                 для получения целого числа.
             ValueError, если после округления accumulation_period - число, меньшее 1.
+            ValueError, если error_rate не лежит в интервале (0, 1).
         """
-        # ваш код
-        pass
+        try:
+            accumulation_period = int(round(accumulation_period))
+        except (TypeError, ValueError, OverflowError) as exc:
+            raise TypeError(
+                f"accumulation_period must be compatible with round(), "
+                f"got {accumulation_period!r}"
+            ) from exc
+
+        if accumulation_period < 1:
+            raise ValueError(
+                f"accumulation_period must be greater than or equal to 1, "
+                f"got {accumulation_period}"
+            )
+
+        self._accumulation_period = accumulation_period
+        self._sketches: Optional[_HyperLogLogRing] = None
+        self._days: deque[np.ndarray] = deque()
+        self._activity: dict[int, int] = {}
 
-    def add_active_users_for_curr_day(self, users: Sequence[UUID]) -> None:
+        if approximate:
+            self._sketches = _HyperLogLogRing(
+                accumulation_period, self._precision_for(error_rate)
+            )
+
+    def add_active_users_for_curr_day(self, users: UsersBatch) -> None:
         """
         Обновляет метрику на основании данных о посещении ресурса для текущего дня.
 
+        Помимо последовательности UUID, метод принимает буфер из подряд идущих
+        16-байтовых UUID или массив NumPy (см. _to_uuid_array). Такие данные
+        не преобразуются в объекты UUID и дедуплицируются векторно, поэтому
+        журнал за день можно передать прямо из файла, отображенного в память:
+
+            with open(path, "rb") as file, mmap.mmap(
+                file.fileno(), 0, access=mmap.ACCESS_READ
+            ) as day_log:
+                pau.add_active_users_for_curr_day(day_log)
+
         Args:
             users: последовательность UUID пользователей, посетивших ресурс
-                в данный день.
+                в данный день, или буфер с их байтовым представлением.
+
+        Raises:
+            ValueError, если буфер или массив имеет неподходящий формат.
+        """
+        uuids = _to_uuid_array(users)
+
+        if self._sketches is not None:
+            self._sketches.add_day(_hash_uuids(uuids))
+            return
+
+        self._push_day(np.unique(uuids))
+
+    def merge(self, *others: "PeriodActiveUsers") -> "PeriodActiveUsers":
+        """
+        Объединяет метрики нескольких шардов в общую метрику.
+
+        Дни шардов сопоставляются по давности: последний добавленный день
+        каждого шарда считается текущим. В точном режиме множества
+        пользователей за день объединяются, в приближенном - берется
+        поэлементный максимум регистров скетчей. Исходные объекты не изменяются.
+
+        Args:
+            others: метрики других шардов.
+
+        Returns:
+            Новый объект с объединенным состоянием.
+
+        Raises:
+            TypeError, если среди others есть объект другого типа.
+            ValueError, если шарды различаются периодом, режимом
+                или точностью скетчей.
+        """
+        shards = (self, *others)
+
+        for shard in others:
+            self._check_compatible(shard)
+
+        merged = type(self)(self._accumulation_period)
+
+        if self._sketches is not None:
+            merged._sketches = _HyperLogLogRing.from_days(
+                np.maximum.reduce([shard._sketches.days for shard in shards])
+            )
+            return merged
+
+        for age in range(max(len(shard._days) for shard in shards), 0, -1):
+            parts = [shard._days[-age] for shard in shards if len(shard._days) >= age]
+            merged._push_day(np.unique(np.concatenate(parts)))
+
+        return merged
+
+    def to_bytes(self) -> bytes:
+        """
+        Сериализует состояние метрики в компактное двоичное представление.
+
+        В точном режиме сохраняются массивы UUID за каждый день окна,
+        в приближенном - регистры скетчей.
+
+        Returns:
+            Снимок состояния, пригодный для from_bytes.
+        """
+        header = self._SNAPSHOT_HEADER.pack(
+            self._SNAPSHOT_MAGIC,
+            self.approximate,
+            self._accumulation_period,
+            0 if self._sketches is None else self._sketches.precision,
+            len(self._days),
+        )
+
+        if self._sketches is not None:
+            return header + self._sketches.days.tobytes()
+
+        sizes = np.array([day.size for day in self._days], dtype="<u8")
+
+        return b"".join([header, sizes.tobytes(), *(day.tobytes() for day in self._days)])
+
+    @classmethod
+    def from_bytes(cls, snapshot: bytes) -> "PeriodActiveUsers":
+        """
+        Восстанавливает метрику из снимка, созданного to_bytes.
+
+        Массивы UUID точного режима ссылаются на память snapshot без копирования.
+
+        Args:
+            snapshot: двоичный снимок состояния.
+
+        Returns:
+            Объект с восстановленным состоянием.
+
+        Raises:
+            ValueError, если снимок поврежден или имеет неизвестный формат.
         """
-        # ваш код
-        pass
+        snapshot = memoryview(snapshot)
+
+        try:
+            magic, approximate, period, precision, days_amount = (
+                cls._SNAPSHOT_HEADER.unpack_from(snapshot)
+            )
+        except struct.error as exc:
+            raise ValueError("snapshot is truncated") from exc
+
+        if magic != cls._SNAPSHOT_MAGIC:
+            raise ValueError("snapshot has unknown format")
+
+        metric = cls(period)
+        body = snapshot[cls._SNAPSHOT_HEADER.size:]
+
+        try:
+            if approximate:
+                days = np.frombuffer(body, dtype=np.uint8).reshape(period, 1 << precision)
+                metric._sketches = _HyperLogLogRing.from_days(days)
+            else:
+                metric._restore_days(body, days_amount)
+        except ValueError as exc:
+            raise ValueError("snapshot is corrupted") from exc
+
+        return metric
 
     @property
     def unique_users_amount(self) -> int:
         """Число уникальных пользователей за последние accumulation_period дней."""
-        # ваш код
-        pass
+        if self._sketches is not None:
+            return self._sketches.estimate
+
+        return len(self._activity)
 
     @property
     def accumulation_period(self) -> int:
         """Период расчета метрики: accumulation_period."""
-        # ваш код
-        pass
+        return self._accumulation_period
+
+    @property
+    def approximate(self) -> bool:
+        """Используется ли приближенный подсчет."""
+        return self._sketches is not None
+
+    def _restore_days(self, body: memoryview, days_amount: int) -> None:
+        sizes = np.frombuffer(body, dtype="<u8", count=days_amount)
+        offset = sizes.nbytes
+
+        for size in sizes.tolist():
+            self._push_day(np.frombuffer(body, dtype=_UUID_DTYPE, count=size, offset=offset))
+            offset += size * _UUID_DTYPE.itemsize
+
+        if offset != len(body):
+            raise ValueError("unexpected snapshot size")
+
+    def _check_compatible(self, other: "PeriodActiveUsers") -> None:
+        if not isinstance(other, PeriodActiveUsers):
+            raise TypeError(f"can't merge PeriodActiveUsers with {type(other).__name__}")
+
+        if other.accumulation_period != self.accumulation_period:
+            raise ValueError("can't merge metrics with different accumulation periods")
+
+        if other.approximate != self.approximate:
+            raise ValueError("can't merge exact and approximate metrics")
+
+        if self.approximate and other._sketches.precision != self._sketches.precision:
+            raise ValueError("can't merge sketches with different precision")
+
+    def _push_day(self, day: np.ndarray) -> None:
+        if len(self._days) == self._accumulation_period:
+            self._forget_day(self._days.popleft())
+
+        activity = self._activity
+
+        for user in _to_ints(day):
+            activity[user] = activity.get(user, 0) + 1
+
+        self._days.append(day)
+
+    def _forget_day(self, day: np.ndarray) -> None:
+        activity = self._activity
+
+        for user in _to_ints(day):
+            days_active = activity[user] - 1
+
+            if days_active:
+                activity[user] = days_active
+            else:
+                del activity[user]
+
+    @classmethod
+    def _precision_for(cls, error_rate: float) -> int:
+        if not 0 < error_rate < 1:
+            raise ValueError(f"error_rate must be in (0, 1), got {error_rate}")
+
+        # стандартная ошибка HyperLogLog: 1.04 / sqrt(2 ** precision)
+        precision = math.ceil(math.log2((1.04 / error_rate) ** 2))
+        lowest, highest = cls._PRECISION_BOUNDS
+
+        return min(max(precision, lowest), highest)
@@ -1,5 +1,10 @@
 from uuid import uuid4
 
+import numpy as np
+
+from utils.batch import OrderBatch
+from utils.models import Order
+
 # Вспомогательная функция
 def is_floats_eq(lhs: float, rhs: float, eps: float = 1e-6) -> bool:
     return abs(lhs - rhs) < eps
@@ -21,4 +26,18 @@ def get_item_amount_discount(order: Order) -> float:
 def get_general_amount_discount(order: Order) -> float:
     if len(order.items) >= 10:
         return order.price * 0.07  # 7% скидка на всю стоимость
-    return 0.0
\ No newline at end of file
+    return 0.0
+
+# Векторизованные функции начисления скидок для пакета заказов
+
+def get_loyalty_discounts(batch: OrderBatch) -> np.ndarray:
+    return np.where(batch.loyalty_points >= 1000, 5.0, 0.0)
+
+def get_item_amount_discounts(batch: OrderBatch) -> np.ndarray:
+    large = batch.item_amounts >= 20
+    return batch.sum_by_order(
+        np.where(large, batch.item_prices * batch.item_amounts * 0.10, 0.0)  # 10% скидка
+    )
+
+def get_general_amount_discounts(batch: OrderBatch) -> np.ndarray:
+    return np.where(batch.items_count >= 10, batch.price * 0.07, 0.0)  # 7% скидка на всю стоимость
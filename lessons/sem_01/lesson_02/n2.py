@@ -1,4 +1,19 @@
 from collections import defaultdict
+from typing import Callable, NamedTuple, Optional
+
+import numpy as np
+
+from n1 import (
+    get_general_amount_discount,
+    get_general_amount_discounts,
+    get_item_amount_discount,
+    get_item_amount_discounts,
+    get_loyalty_discount,
+    get_loyalty_discounts,
+    is_floats_eq,
+)
+from utils.batch import OrderBatch
+from utils.models import Order
 
 # Глобальные счетчики
 discount_counters = {
@@ -24,3 +39,99 @@ def calculate_best_discount(order: Order):
             discount_counters[key] += 1
 
     return order.price - max_discount
+
+
+# Пакетный расчет скидок
+
+# Векторизованная стратегия: по пакету заказов возвращает массив скидок
+BatchDiscountStrategy = Callable[[OrderBatch], np.ndarray]
+
+# Реестр стратегий в порядке регистрации
+discount_strategies: dict[str, BatchDiscountStrategy] = {
+    'loyalty_discount': get_loyalty_discounts,
+    'item_amount_discount': get_item_amount_discounts,
+    'general_amount_discount': get_general_amount_discounts,
+}
+
+
+def register_discount_strategy(
+    name: str,
+) -> Callable[[BatchDiscountStrategy], BatchDiscountStrategy]:
+    """
+    Регистрирует векторизованную стратегию скидки.
+
+    Используется как декоратор:
+
+        @register_discount_strategy('holiday_discount')
+        def get_holiday_discounts(batch: OrderBatch) -> np.ndarray:
+            return batch.price * 0.03
+
+    Args:
+        name: имя стратегии.
+
+    Returns:
+        Декоратор, добавляющий стратегию в реестр и возвращающий ее без изменений.
+
+    Raises:
+        ValueError, если стратегия с таким именем уже зарегистрирована.
+    """
+    if name in discount_strategies:
+        raise ValueError(f"discount strategy {name!r} is already registered")
+
+    def register(strategy: BatchDiscountStrategy) -> BatchDiscountStrategy:
+        discount_strategies[name] = strategy
+        return strategy
+
+    return register
+
+
+class BestDiscounts(NamedTuple):
+    """
+    Результат пакетного расчета скидок.
+
+    Attrs:
+        prices: стоимости заказов с учетом лучшей скидки в порядке batch.order_ids.
+        best: номер выбранной стратегии для каждого заказа.
+        win_counts: число заказов, для которых скидка стратегии максимальна
+            (с точностью до eps), - как в discount_counters.
+        names: имена стратегий в порядке номеров.
+    """
+    prices: np.ndarray
+    best: np.ndarray
+    win_counts: np.ndarray
+    names: tuple[str, ...]
+
+
+def calculate_best_discounts(
+    batch: OrderBatch,
+    strategies: Optional[dict[str, BatchDiscountStrategy]] = None,
+    eps: float = 1e-6,
+) -> BestDiscounts:
+    """
+    Применяет к каждому заказу пакета максимальную из доступных скидок.
+
+    Каждая стратегия вызывается один раз для всего пакета, лучшая скидка
+    выбирается с помощью argmax по матрице скидок. Глобальные счетчики
+    не изменяются.
+
+    Args:
+        batch: пакет заказов.
+        strategies: стратегии скидок. Значение по умолчанию - None,
+            все зарегистрированные стратегии.
+        eps: точность сравнения скидки с максимальной при подсчете побед.
+
+    Returns:
+        Структура BestDiscounts.
+    """
+    strategies = discount_strategies if strategies is None else strategies
+    names = tuple(strategies)
+    discounts = np.empty((len(names), len(batch)))
+
+    for row, strategy in zip(discounts, strategies.values()):
+        row[...] = strategy(batch)
+
+    best = np.argmax(discounts, axis=0)
+    max_discount = discounts[best, np.arange(len(batch))]
+    win_counts = np.count_nonzero(np.abs(discounts - max_discount) < eps, axis=1)
+
+    return BestDiscounts(batch.price - max_discount, best, win_counts, names)
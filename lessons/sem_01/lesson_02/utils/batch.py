@@ -0,0 +1,177 @@
+from typing import Callable, Iterable, Optional, Sequence
+
+import numpy as np
+
+from utils.models import Order
+
+
+class OrderBatch:
+    """
+    Пакет заказов из Интернет-магазина в столбцовом представлении.
+
+    Вместо объекта на каждый товар пакет хранит по одному массиву на каждый
+    столбец: идентификатор заказа, цену и количество для каждой позиции.
+    Стоимости всех заказов вычисляются одной группировкой с суммированием.
+
+    Attrs:
+        order_ids: идентификаторы заказов в порядке возрастания.
+        price: стоимости заказов в порядке order_ids.
+        items_count: число позиций в заказах в порядке order_ids.
+        loyalty_points: количество баллов лояльности покупателей
+            в порядке order_ids.
+        item_order: номер заказа в order_ids для каждой позиции.
+        item_prices: цены единицы товара для каждой позиции.
+        item_amounts: количества товаров для каждой позиции.
+    """
+
+    order_ids: np.ndarray
+    price: np.ndarray
+    items_count: np.ndarray
+    loyalty_points: np.ndarray
+    item_order: np.ndarray
+    item_prices: np.ndarray
+    item_amounts: np.ndarray
+
+    def __init__(
+        self,
+        order_ids: Sequence,
+        prices: Sequence[float],
+        amounts: Sequence[int],
+        loyalty_points: Optional[Sequence[int]] = None,
+    ) -> None:
+        """
+        Инициализирует пакет заказов.
+
+        При инициализации вычисляются стоимости всех заказов. Если позиции
+        упорядочены по идентификатору заказа, группировка выполняется
+        за линейное время, иначе требуется сортировка.
+
+        Args:
+            order_ids: идентификатор заказа для каждой позиции.
+            prices: цена единицы товара для каждой позиции.
+            amounts: количество товаров для каждой позиции.
+            loyalty_points: количество баллов лояльности покупателя для каждой
+                позиции, одинаковое для всех позиций заказа. Значение по
+                умолчанию - None, у всех покупателей 0 баллов.
+
+        Raises:
+            ValueError, если длины столбцов не совпадают.
+        """
+        order_ids = np.asarray(order_ids).ravel()
+        self.item_prices = np.asarray(prices, dtype=np.float64).ravel()
+        self.item_amounts = np.asarray(amounts, dtype=np.int64).ravel()
+
+        if loyalty_points is None:
+            loyalty_points = np.zeros(order_ids.size, dtype=np.int64)
+
+        loyalty_points = np.asarray(loyalty_points, dtype=np.int64).ravel()
+        sizes = {
+            order_ids.size, self.item_prices.size, self.item_amounts.size, loyalty_points.size
+        }
+
+        if len(sizes) > 1:
+            raise ValueError(f"columns must have equal sizes, got sizes {sorted(sizes)}")
+
+        self.order_ids, self.item_order = _group(order_ids)
+        self.price = self.sum_by_order(self.item_prices * self.item_amounts)
+        self.items_count = np.bincount(self.item_order, minlength=len(self))
+        self.loyalty_points = np.zeros(len(self), dtype=np.int64)
+        self.loyalty_points[self.item_order] = loyalty_points
+
+    @classmethod
+    def from_orders(cls, orders: Iterable[Order]) -> "OrderBatch":
+        """
+        Собирает пакет из заказов.
+
+        Идентификатор заказа - его номер в последовательности orders.
+
+        Args:
+            orders: заказы.
+
+        Returns:
+            Пакет заказов. Заказы без товаров в пакет не попадают.
+        """
+        order_ids, prices, amounts, loyalty_points = [], [], [], []
+
+        for order_id, order in enumerate(orders):
+            for item in order.items:
+                order_ids.append(order_id)
+                prices.append(item.price)
+                amounts.append(item.amount)
+                loyalty_points.append(order.customer.loyalty_points)
+
+        return cls(
+            np.array(order_ids, dtype=np.int64),
+            np.array(prices, dtype=np.float64),
+            np.array(amounts, dtype=np.int64),
+            np.array(loyalty_points, dtype=np.int64),
+        )
+
+    def __len__(self) -> int:
+        return self.order_ids.size
+
+    def sum_by_order(self, values: np.ndarray) -> np.ndarray:
+        """
+        Суммирует значения позиций по заказам.
+
+        Args:
+            values: массив значений для каждой позиции.
+
+        Returns:
+            Массив сумм в порядке order_ids.
+        """
+        return np.bincount(self.item_order, weights=values, minlength=len(self))
+
+    def get_discounted_prices(
+        self, apply_discount: Callable[["OrderBatch"], np.ndarray]
+    ) -> np.ndarray:
+        """
+        Вычисляет стоимости заказов с учетом примененной скидки.
+
+        Args:
+            apply_discount: функция для расчета скидок всех заказов пакета.
+
+        Returns:
+            Массив стоимостей заказов с учетом скидки в порядке order_ids.
+
+        Raises:
+            ValueError, если расчитанная скидка превышает стоимость
+                хотя бы одного заказа.
+        """
+        discounts = np.broadcast_to(
+            np.asarray(apply_discount(self), dtype=np.float64), self.price.shape
+        )
+        exceeding = np.flatnonzero(self.price < discounts)
+
+        if exceeding.size:
+            index = exceeding[0]
+            raise ValueError(
+                f"discount {discounts[index]} is grater than total price "
+                f"{self.price[index]} of order {self.order_ids[index]}"
+            )
+
+        return self.price - discounts
+
+
+def _group(keys: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Группирует одинаковые ключи.
+
+    Args:
+        keys: одномерный массив ключей.
+
+    Returns:
+        Пару массивов: уникальные ключи в порядке возрастания и номер
+        уникального ключа для каждого элемента keys.
+    """
+    if keys.size and (keys[1:] >= keys[:-1]).all():
+        # ключи уже отсортированы: группы - отрезки одинаковых ключей
+        starts = np.empty(keys.size, dtype=bool)
+        starts[0] = True
+        np.not_equal(keys[1:], keys[:-1], out=starts[1:])
+
+        return keys[starts], np.cumsum(starts) - 1
+
+    unique, inverse = np.unique(keys, return_inverse=True)
+
+    return unique, inverse.ravel()
@@ -0,0 +1,193 @@
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Optional, Union
+from uuid import UUID
+
+from utils.models import Order
+
+
+@dataclass(frozen=True, slots=True)
+class CompactItem:
+    """
+    Товар из Интернет-магазина без словаря атрибутов.
+
+    В отличие от Item, товар неизменяем: так стоимость заказа, в котором
+    он лежит, может быть закеширована. Для изменения товара в заказе
+    нужно заменить его в списке, например с помощью dataclasses.replace.
+
+    Attrs:
+        label: наименования товара.
+        price: цена единицы товара.
+        amount: количество товаров. Значение по умолчанию - 1.
+    """
+    label: str
+    price: float
+    amount: int = 1
+
+
+class CompactCustomer:
+    """
+    Основная информация о пользователе Интенет-магазина без словаря атрибутов.
+
+    Идентификатор хранится как 128-битное целое число, а объект UUID
+    создается только при обращении к customer_id.
+
+    Attrs:
+        customer_id: идентификатор пользователя.
+        username: имя пользователя.
+        loyalty_points: количество баллов лояльности. Значение по умолчанию - 0.
+    """
+
+    __slots__ = ("_customer_id", "username", "loyalty_points")
+
+    def __init__(
+        self,
+        customer_id: Union[UUID, int],
+        username: str,
+        loyalty_points: int = 0,
+    ) -> None:
+        """
+        Инициализирует информацию о пользователе.
+
+        Args:
+            customer_id: идентификатор пользователя или его 128-битное представление.
+            username: имя пользователя.
+            loyalty_points: количество баллов лояльности. Значение по умолчанию - 0.
+        """
+        self.customer_id = customer_id
+        self.username = username
+        self.loyalty_points = loyalty_points
+
+    @property
+    def customer_id(self) -> UUID:
+        return UUID(int=self._customer_id)
+
+    @customer_id.setter
+    def customer_id(self, customer_id: Union[UUID, int]) -> None:
+        if isinstance(customer_id, UUID):
+            customer_id = customer_id.int
+        elif not 0 <= customer_id < 1 << 128:
+            raise ValueError(f"customer_id must be a 128-bit integer, got {customer_id}")
+
+        self._customer_id = customer_id
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, CompactCustomer):
+            return NotImplemented
+
+        return (self._customer_id, self.username, self.loyalty_points) == (
+            other._customer_id, other.username, other.loyalty_points
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}(customer_id={self.customer_id!r}, "
+            f"username={self.username!r}, loyalty_points={self.loyalty_points!r})"
+        )
+
+
+class _ItemList(list):
+    """
+    Список товаров заказа, кеширующий их общую стоимость.
+
+    Любая операция, изменяющая состав списка, сбрасывает кеш.
+    """
+
+    __slots__ = ("_price",)
+
+    def __init__(self, items: Iterable[CompactItem] = ()) -> None:
+        super().__init__(items)
+        self._price: Optional[float] = None
+
+    @property
+    def price(self) -> float:
+        if self._price is None:
+            self._price = sum(item.price * item.amount for item in self)
+
+        return self._price
+
+    def _invalidating(name: str) -> Callable:
+        method = getattr(list, name)
+
+        def invalidate(self: "_ItemList", *args: Any) -> Any:
+            self._price = None
+            return method(self, *args)
+
+        invalidate.__name__ = name
+        return invalidate
+
+    __setitem__ = _invalidating("__setitem__")
+    __delitem__ = _invalidating("__delitem__")
+    __iadd__ = _invalidating("__iadd__")
+    __imul__ = _invalidating("__imul__")
+    append = _invalidating("append")
+    extend = _invalidating("extend")
+    insert = _invalidating("insert")
+    pop = _invalidating("pop")
+    remove = _invalidating("remove")
+    clear = _invalidating("clear")
+
+    del _invalidating
+
+    def __reduce__(self) -> tuple:
+        return type(self), (list(self),)
+
+
+class CompactOrder:
+    """
+    Заказ из Интернет-магазина без словаря атрибутов.
+
+    Стоимость заказа вычисляется при первом обращении и кешируется до
+    изменения списка товаров: добавления, удаления или замены товара
+    либо присваивания нового списка.
+
+    Attrs:
+        customer: информация о покупателе.
+        items: список купленных товаров.
+        price: стоимость заказа.
+    """
+
+    __slots__ = ("customer", "_items")
+
+    def __init__(
+        self,
+        customer: CompactCustomer,
+        items: Iterable[CompactItem],
+    ) -> None:
+        """
+        Инициализирует заказ.
+
+        Args:
+            customer: информация о покупателе.
+            items: купленные товары.
+        """
+        self.customer = customer
+        self.items = items
+
+    @property
+    def items(self) -> list[CompactItem]:
+        return self._items
+
+    @items.setter
+    def items(self, items: Iterable[CompactItem]) -> None:
+        self._items = _ItemList(items)
+
+    @property
+    def price(self) -> float:
+        return self._items.price
+
+    def get_discounted_price(
+        self, apply_discount: Callable[["CompactOrder"], float]
+    ) -> float:
+        """
+        Вычисляет стоимость заказа с учетом примененной скидки.
+
+        Args:
+            apply_discount: функция для расчета скидки на основании информации о заказе.
+
+        Returns:
+            Число с плавающей точкой - стоимость заказа с учетом скидки.
+
+        Raises:
+            ValueError, если расчитанная скидка превышает общую стоимость заказа.
+        """
+        return Order.get_discounted_price(self, apply_discount)
@@ -0,0 +1,85 @@
+from typing import Callable
+from uuid import uuid4
+
+import numpy as np
+import pytest
+
+from utils.batch import OrderBatch
+from utils.models import (
+    Customer,
+    Item,
+    Order,
+)
+
+
+class TestOrderBatch:
+    ORDER_IDS: list[int] = [7, 3, 7, 5, 3]
+    PRICES: list[float] = [25, 10, 50, 1.5, 5]
+    AMOUNTS: list[int] = [2, 1, 1, 4, 3]
+
+    def test_initialization(self) -> None:
+        batch = OrderBatch(self.ORDER_IDS, self.PRICES, self.AMOUNTS)
+
+        assert batch.order_ids.tolist() == [3, 5, 7]
+        assert batch.price.tolist() == [25, 6, 100]
+
+    def test_initialization_sorted(self) -> None:
+        order = np.argsort(self.ORDER_IDS, kind="stable")
+
+        batch = OrderBatch(
+            np.take(self.ORDER_IDS, order),
+            np.take(self.PRICES, order),
+            np.take(self.AMOUNTS, order),
+        )
+
+        assert batch.order_ids.tolist() == [3, 5, 7]
+        assert batch.price.tolist() == [25, 6, 100]
+
+    def test_initialization_order_columns(self) -> None:
+        batch = OrderBatch(
+            self.ORDER_IDS, self.PRICES, self.AMOUNTS, loyalty_points=[10, 0, 10, 2000, 0]
+        )
+
+        assert batch.items_count.tolist() == [2, 1, 2]
+        assert batch.loyalty_points.tolist() == [0, 2000, 10]
+
+    def test_initialization_fail(self) -> None:
+        with pytest.raises(ValueError):
+            _ = OrderBatch(self.ORDER_IDS, self.PRICES, self.AMOUNTS[:-1])
+
+    def test_from_orders(self) -> None:
+        customer = Customer(customer_id=uuid4(), username="user#1", loyalty_points=1000)
+        orders = [
+            Order(customer, [Item(label="1", amount=2, price=25), Item(label="2", price=50)]),
+            Order(customer, [Item(label="3", amount=3, price=0.1)]),
+        ]
+
+        batch = OrderBatch.from_orders(orders)
+
+        assert batch.price.tolist() == pytest.approx([order.price for order in orders])
+        assert batch.loyalty_points.tolist() == [1000, 1000]
+
+    def test_get_discounted_prices_fail(self) -> None:
+        batch = OrderBatch(self.ORDER_IDS, self.PRICES, self.AMOUNTS)
+
+        with pytest.raises(ValueError):
+            _ = batch.get_discounted_prices(lambda _: 10)
+
+    @pytest.mark.parametrize(
+        "apply_discount,prices_expected",
+        [
+            (lambda _: 6, [19, 0, 94]),
+            (lambda batch: batch.price * 0.5, [12.5, 3, 50]),
+        ],
+        ids=["discount-scalar", "discount-array"],
+    )
+    def test_get_discounted_prices_success(
+        self,
+        apply_discount: Callable[[OrderBatch], np.ndarray],
+        prices_expected: list[float],
+    ) -> None:
+        batch = OrderBatch(self.ORDER_IDS, self.PRICES, self.AMOUNTS)
+
+        prices_discounted = batch.get_discounted_prices(apply_discount)
+
+        assert prices_discounted.tolist() == prices_expected
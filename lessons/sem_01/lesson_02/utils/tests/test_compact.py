@@ -0,0 +1,77 @@
+from dataclasses import FrozenInstanceError, replace
+from uuid import uuid4
+
+import pytest
+
+from utils.compact import (
+    CompactCustomer,
+    CompactItem,
+    CompactOrder,
+)
+
+
+class TestCompactCustomer:
+    def test_customer_id(self) -> None:
+        customer_id = uuid4()
+
+        customer = CompactCustomer(customer_id=customer_id, username="user#1")
+
+        assert customer.customer_id == customer_id
+        assert customer == CompactCustomer(customer_id=customer_id.int, username="user#1")
+        assert not hasattr(customer, "__dict__")
+
+    def test_customer_id_fail(self) -> None:
+        with pytest.raises(ValueError):
+            _ = CompactCustomer(customer_id=1 << 128, username="user#1")
+
+
+class TestCompactOrder:
+    CUSTOMER: CompactCustomer = CompactCustomer(
+        customer_id=uuid4(),
+        username="user#1",
+    )
+
+    def make_order(self) -> CompactOrder:
+        return CompactOrder(
+            customer=self.CUSTOMER,
+            items=[
+                CompactItem(label="1", amount=2, price=25),
+                CompactItem(label="2", price=50),
+            ],
+        )
+
+    def test_initialization(self) -> None:
+        order = self.make_order()
+
+        assert order.price == 100
+        assert not hasattr(order, "__dict__")
+
+    def test_price_invalidation(self) -> None:
+        order = self.make_order()
+        _ = order.price
+
+        order.items.append(CompactItem(label="3", price=10))
+        assert order.price == 110
+
+        order.items[0] = replace(order.items[0], amount=1)
+        assert order.price == 85
+
+        del order.items[1]
+        assert order.price == 35
+
+        order.items = [CompactItem(label="4", price=5)]
+        assert order.price == 5
+
+    def test_item_immutable(self) -> None:
+        order = self.make_order()
+
+        with pytest.raises(FrozenInstanceError):
+            order.items[0].price = 0
+
+    def test_get_discounted_price(self) -> None:
+        order = self.make_order()
+
+        assert order.get_discounted_price(lambda _: 20) == 80
+
+        with pytest.raises(ValueError):
+            _ = order.get_discounted_price(lambda _: 120)
@@ -0,0 +1,75 @@
+from uuid import uuid4
+
+import numpy as np
+import pytest
+
+import n2
+from n2 import (
+    calculate_best_discount,
+    calculate_best_discounts,
+    register_discount_strategy,
+)
+from utils.batch import OrderBatch
+from utils.models import (
+    Customer,
+    Item,
+    Order,
+)
+
+
+class TestCalculateBestDiscounts:
+    def make_orders(self) -> list[Order]:
+        regular = Customer(customer_id=uuid4(), username="user#1")
+        loyal = Customer(customer_id=uuid4(), username="user#2", loyalty_points=1500)
+
+        return [
+            Order(regular, [Item(label="1", price=10)]),
+            Order(loyal, [Item(label="2", price=30)]),
+            Order(regular, [Item(label="3", amount=25, price=4), Item(label="4", price=2)]),
+            Order(loyal, [Item(label=str(i), amount=2, price=15) for i in range(12)]),
+            Order(loyal, [Item(label="5", amount=20, price=1)]),
+        ]
+
+    @pytest.fixture(autouse=True)
+    def isolate_globals(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(n2, "discount_counters", dict.fromkeys(n2.discount_counters, 0))
+        monkeypatch.setattr(n2, "discount_strategies", dict(n2.discount_strategies))
+
+    def test_matches_scalar(self) -> None:
+        orders = self.make_orders()
+
+        result = calculate_best_discounts(OrderBatch.from_orders(orders))
+
+        assert result.prices.tolist() == pytest.approx(
+            [calculate_best_discount(order) for order in orders]
+        )
+        assert result.names == tuple(n2.discount_counters)
+        assert result.win_counts.tolist() == list(n2.discount_counters.values())
+
+    def test_best_strategy(self) -> None:
+        result = calculate_best_discounts(OrderBatch.from_orders(self.make_orders()))
+
+        assert [result.names[best] for best in result.best] == [
+            "loyalty_discount",
+            "loyalty_discount",
+            "item_amount_discount",
+            "general_amount_discount",
+            "loyalty_discount",
+        ]
+
+    def test_register_strategy(self) -> None:
+        @register_discount_strategy("holiday_discount")
+        def get_holiday_discounts(batch: OrderBatch) -> np.ndarray:
+            return batch.price * 0.5
+
+        result = calculate_best_discounts(OrderBatch.from_orders(self.make_orders()))
+
+        assert n2.discount_strategies["holiday_discount"] is get_holiday_discounts
+        assert result.names[-1] == "holiday_discount"
+        assert result.best.tolist() == [3] * 5
+
+    def test_register_strategy_fail(self) -> None:
+        with pytest.raises(ValueError):
+            _ = register_discount_strategy("loyalty_discount")
+
+        assert n2.discount_strategies["loyalty_discount"] is n2.get_loyalty_discounts
@@ -1,18 +1,289 @@
-from typing import Callable
+import math
+
+from array import array
+from bisect import bisect_left, insort
+from collections import deque
+from typing import Callable, Optional
+
+import numpy as np
+
+class _Window:
+    """Кольцевой буфер последних capacity наблюдений."""
+
+    __slots__ = ("values", "size", "position")
+
+    def __init__(self, capacity: int) -> None:
+        if capacity < 1:
+            raise ValueError(f"accumulation_period must be positive, got {capacity}")
+
+        self.values = array("d", bytes(8 * capacity))
+        self.size = 0
+        self.position = 0
+
+    def push(self, value: float) -> Optional[float]:
+        """Добавляет наблюдение и возвращает вытесненное, если буфер был заполнен."""
+        capacity = len(self.values)
+        evicted = self.values[self.position] if self.size == capacity else None
+
+        self.values[self.position] = value
+        self.position = (self.position + 1) % capacity
+        self.size = min(self.size + 1, capacity)
+
+        return evicted
+
+    def history(self) -> np.ndarray:
+        """Возвращает наблюдения из буфера в порядке поступления."""
+        values = np.frombuffer(self.values, dtype=float)
+        if self.size < len(self.values):
+            return values[:self.size].copy()
+        return np.concatenate((values[self.position:], values[:self.position]))
+
+    def extend(self, series: np.ndarray) -> None:
+        """Заменяет содержимое буфера последними наблюдениями series."""
+        tail = series[-len(self.values):]
+        np.frombuffer(self.values, dtype=float)[:len(tail)] = tail
+        self.size = len(tail)
+        self.position = len(tail) % len(self.values)
+
+def _fsum(values: np.ndarray) -> float:
+    """Точная сумма; для бесконечностей, NaN и переполнения - как у обычной суммы."""
+    try:
+        return math.fsum(values)
+    except (OverflowError, ValueError):
+        return float(np.sum(values))
+
+def _sliding_reduce(
+    series: np.ndarray, period: int, ufunc: np.ufunc, fill: float
+) -> np.ndarray:
+    # Свертка ассоциативной операцией по окнам длины period за O(len(series)):
+    # ряд делится на блоки длины period, окно - суффикс одного блока и
+    # префикс следующего, а префиксы и суффиксы блоков считаются накоплением.
+    # Для суммы ошибка округления ограничена period слагаемыми и не накапливается.
+    length = len(series)
+    blocks = -(-length // period)
+    padded = np.full(blocks * period, fill)
+    padded[:length] = series
+    grid = padded.reshape(blocks, period)
+
+    prefix = ufunc.accumulate(grid, axis=1).ravel()[:length]
+    suffix = ufunc.accumulate(grid[:, ::-1], axis=1)[:, ::-1].ravel()
+
+    starts = np.arange(length) - period + 1
+    inner = (starts > 0) & (starts % period != 0)
+    result = prefix.copy()
+    result[inner] = ufunc(suffix[starts[inner]], prefix[inner])
+    return result
 
 def make_averager(accumulation_period: int) -> Callable[[float], float]:
-    values = []
+    """
+    Создает функцию скользящего среднего по последним accumulation_period наблюдениям.
+
+    Пока наблюдений меньше периода, берется среднее по всем наблюдениям.
+    Время вызова и память не зависят от числа наблюдений: наблюдения
+    хранятся в кольцевом буфере, а сумма окна обновляется с компенсацией
+    ошибки округления (алгоритм Ноймайера).
+
+    Атрибут process_many возвращаемой функции обрабатывает массив NumPy
+    целиком и возвращает массив средних, как при поэлементных вызовах.
+    """
+    window = _Window(accumulation_period)
+    total = 0.0
+    compensation = 0.0
+
+    def add(value: float) -> None:
+        nonlocal total, compensation
+
+        new_total = total + value
+        if not math.isfinite(new_total):
+            # компенсация для бесконечной суммы дала бы inf - inf = NaN
+            total = new_total
+        elif abs(total) >= abs(value):
+            compensation += (total - new_total) + value
+        else:
+            compensation += (value - new_total) + total
+        total = new_total
+
+    def resync() -> None:
+        nonlocal total, compensation
+
+        history = window.history()
+        total = _fsum(history)
+        # остаток точной суммы, не поместившийся в total
+        compensation = math.fsum(np.append(history, -total)) if math.isfinite(total) else 0.0
 
     def get_avg(income: float) -> float:
-        nonlocal values
-        
-        values.append(income)
-        
-        # Если количество наблюдений меньше периода, берем среднее по всем наблюдениям
-        if len(values) < accumulation_period:
-            return sum(values) / len(values)
-        
-        # Иначе берем среднее по последним accumulation_period наблюдениям
-        return sum(values[-accumulation_period:]) / accumulation_period
-
-    return get_avg
\ No newline at end of file
+        evicted = window.push(income)
+
+        if evicted is not None and not math.isfinite(total):
+            # в окне была бесконечность, NaN или переполнение - вычитание
+            # их не уберет, поэтому сумма окна пересчитывается
+            resync()
+        else:
+            if evicted is not None:
+                add(-evicted)
+            add(income)
+
+        if not math.isfinite(total):
+            return total / window.size
+        return (total + compensation) / window.size
+
+    def process_many(incomes: np.ndarray) -> np.ndarray:
+        incomes = np.asarray(incomes, dtype=float).ravel()
+        history = window.history()
+        series = np.concatenate((history, incomes))
+
+        sums = _sliding_reduce(series, accumulation_period, np.add, 0.0)[len(history):]
+        counts = np.minimum(np.arange(len(history) + 1, len(series) + 1), accumulation_period)
+
+        window.extend(series)
+        resync()
+
+        return sums / counts
+
+    get_avg.process_many = process_many
+    return get_avg
+
+def _make_rolling_extremum(
+    accumulation_period: int, ufunc: np.ufunc, fill: float
+) -> Callable[[float], float]:
+    window = _Window(accumulation_period)
+    # монотонная очередь: (номер наблюдения, значение) - кандидаты в экстремум
+    candidates: deque[tuple[int, float]] = deque()
+    count = 0
+
+    def get_extremum(income: float) -> float:
+        nonlocal count
+
+        window.push(income)
+        while candidates and ufunc(income, candidates[-1][1]) == income:
+            candidates.pop()
+        candidates.append((count, income))
+        if candidates[0][0] <= count - accumulation_period:
+            candidates.popleft()
+        count += 1
+
+        return candidates[0][1]
+
+    def process_many(incomes: np.ndarray) -> np.ndarray:
+        nonlocal count
+
+        incomes = np.asarray(incomes, dtype=float).ravel()
+        history = window.history()
+        series = np.concatenate((history, incomes))
+        result = _sliding_reduce(series, accumulation_period, ufunc, fill)[len(history):]
+
+        window.extend(series)
+        count += len(incomes)
+
+        # наблюдение остается кандидатом, если оно строго лучше всех последующих
+        tail = window.history()
+        later = ufunc.accumulate(np.concatenate(([fill], tail[:0:-1])))[::-1]
+        keep = np.flatnonzero((ufunc(tail, later) == tail) & (tail != later))
+        candidates.clear()
+        candidates.extend(zip((count - len(tail) + keep).tolist(), tail[keep].tolist()))
+
+        return result
+
+    get_extremum.process_many = process_many
+    return get_extremum
+
+def make_rolling_min(accumulation_period: int) -> Callable[[float], float]:
+    """
+    Создает функцию скользящего минимума по последним accumulation_period наблюдениям.
+
+    Минимум находится с помощью монотонной очереди за амортизированное O(1).
+    Атрибут process_many обрабатывает массив NumPy целиком.
+    """
+    return _make_rolling_extremum(accumulation_period, np.minimum, math.inf)
+
+def make_rolling_max(accumulation_period: int) -> Callable[[float], float]:
+    """
+    Создает функцию скользящего максимума по последним accumulation_period наблюдениям.
+
+    Максимум находится с помощью монотонной очереди за амортизированное O(1).
+    Атрибут process_many обрабатывает массив NumPy целиком.
+    """
+    return _make_rolling_extremum(accumulation_period, np.maximum, -math.inf)
+
+def make_rolling_variance(accumulation_period: int, ddof: int = 0) -> Callable[[float], float]:
+    """
+    Создает функцию скользящей дисперсии по последним accumulation_period наблюдениям.
+
+    Среднее и сумма квадратов отклонений обновляются методом Уэлфорда
+    за O(1). Они точно пересчитываются по буферу раз в accumulation_period
+    наблюдений, а также когда сумма квадратов уменьшилась на много порядков
+    (из окна ушел выброс) и ошибка округления стала сравнима с ней самой.
+    Если наблюдений не больше ddof, возвращается NaN.
+    """
+    window = _Window(accumulation_period)
+    mean = 0.0
+    squares = 0.0
+    # наибольшая сумма квадратов с последнего пересчета - масштаб ошибки округления
+    peak = 0.0
+
+    def get_var(income: float) -> float:
+        nonlocal mean, squares, peak
+
+        evicted = window.push(income)
+
+        if evicted is None:
+            delta = income - mean
+            mean += delta / window.size
+            squares += delta * (income - mean)
+        else:
+            old_mean = mean
+            mean += (income - evicted) / window.size
+            squares += (income - evicted) * (income - mean + evicted - old_mean)
+        peak = max(peak, squares)
+
+        if window.position == 0 or squares < peak * 1e-6 or not math.isfinite(mean + squares):
+            history = window.history()
+            mean = _fsum(history) / window.size
+            squares = peak = _fsum((history - mean) ** 2)
+
+        if window.size <= ddof:
+            return math.nan
+        return max(squares, 0.0) / (window.size - ddof)
+
+    return get_var
+
+def make_rolling_quantile(accumulation_period: int, q: float) -> Callable[[float], float]:
+    """
+    Создает функцию скользящего q-квантиля по последним accumulation_period наблюдениям.
+
+    Наблюдения окна хранятся упорядоченными, квантиль вычисляется линейной
+    интерполяцией, как в numpy.quantile. Место наблюдения находится
+    бинарным поиском, а вставка и удаление сдвигают не более
+    accumulation_period ссылок. NaN не участвует в упорядочивании:
+    пока он есть в окне, как и в numpy.quantile, возвращается NaN.
+    """
+    if not 0 <= q <= 1:
+        raise ValueError(f"q must be in [0, 1], got {q}")
+
+    window = _Window(accumulation_period)
+    ordered: list[float] = []
+    nans = 0
+
+    def get_quantile(income: float) -> float:
+        nonlocal nans
+
+        evicted = window.push(income)
+        if evicted is not None and math.isnan(evicted):
+            nans -= 1
+        elif evicted is not None:
+            del ordered[bisect_left(ordered, evicted)]
+
+        if math.isnan(income):
+            nans += 1
+        else:
+            insort(ordered, income)
+
+        if nans:
+            return math.nan
+
+        position = q * (len(ordered) - 1)
+        lower = math.floor(position)
+        upper = min(lower + 1, len(ordered) - 1)
+        return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+    return get_quantile
@@ -0,0 +1,322 @@
+import asyncio
+
+from concurrent.futures import Executor
+from itertools import groupby
+from operator import itemgetter
+from typing import Any, Callable, Iterable, Optional
+from uuid import UUID
+
+from n import VALIDATION_MESSAGES, Person, PersonDB, ValidationReport
+
+# результат запроса: (True, значение) или (False, исключение)
+_Outcome = tuple[bool, Any]
+
+def _call(method: Callable, *args: Any) -> _Outcome:
+    try:
+        return True, method(*args)
+    except Exception as error:
+        return False, error
+
+def _read_batch(database: PersonDB, person_ids: list[UUID]) -> list[_Outcome]:
+    try:
+        return [(True, person) for person in database.read_many(person_ids)]
+    except KeyError:
+        # в пакете есть отсутствующий пользователь - читаем по одному
+        return [_call(database.read_person_info, person_id) for person_id in person_ids]
+
+def _create_batch(database: PersonDB, persons: list[Person]) -> list[_Outcome]:
+    if not all(isinstance(value, str) for person in persons for value in vars(person).values()):
+        # запись с полем не того типа может нарушить пакетную вставку
+        raise TypeError("Поля пользователя должны быть строками.")
+
+    # в отличие от create_many, import_persons создает валидные записи пакета,
+    # а повтор логина в пакете - ошибка всех записей, кроме первой, как и при
+    # последовательном создании
+    created, report = database.import_persons(persons)
+    return [
+        (True, created[number]) if number in created
+        else (False, ValueError(VALIDATION_MESSAGES[report.errors[number][0]]))
+        for number in range(len(persons))
+    ]
+
+def _delete_batch(database: PersonDB, person_ids: list[UUID]) -> list[_Outcome]:
+    if len(set(person_ids)) == len(person_ids):
+        try:
+            database.delete_many(person_ids)
+            return [(True, None)] * len(person_ids)
+        except KeyError:
+            pass
+    return [_call(database.delete_person, person_id) for person_id in person_ids]
+
+# одиночные запросы, которые объединяются в пакетные операции
+_BATCH_HANDLERS: dict[str, Callable[[PersonDB, list], list[_Outcome]]] = {
+    "read_person_info": _read_batch,
+    "create_person": _create_batch,
+    "delete_person": _delete_batch,
+}
+
+def _execute(database: PersonDB, requests: list[tuple[str, tuple]]) -> list[_Outcome]:
+    """
+    Выполняет запросы по порядку, объединяя подряд идущие однотипные запросы.
+
+    Если пакетная операция отвергла аргументы одного из запросов с TypeError
+    до изменения базы, запросы ее группы выполняются по одному, чтобы каждый
+    вызывающий получил свой результат. После любой другой ошибки база могла
+    быть изменена частично (например, DurablePersonDB не смогла записать
+    журнал), поэтому повтор небезопасен и ошибка передается всей группе.
+    """
+    outcomes = []
+    for method, group in groupby(requests, key=itemgetter(0)):
+        arguments = [args for _, args in group]
+        handler = _BATCH_HANDLERS.get(method)
+        if handler is not None and len(arguments) > 1:
+            try:
+                outcomes.extend(handler(database, [args[0] for args in arguments]))
+                continue
+            except TypeError:
+                pass
+            except Exception as error:
+                outcomes.extend([(False, error)] * len(arguments))
+                continue
+        outcomes.extend(_call(getattr(database, method), *args) for args in arguments)
+    return outcomes
+
+class AsyncPersonDB:
+    """
+    Асинхронный интерфейс к базе данных пользователей.
+
+    Запросы ставятся в ограниченную очередь, а обработчик забирает из нее
+    все накопившиеся запросы и выполняет их одним пакетом в пуле потоков,
+    не блокируя цикл событий. Подряд идущие чтения, создания и удаления
+    объединяются в read_many, import_persons и delete_many; остальные
+    запросы пакета выполняются по одному. Запросы выполняются в порядке
+    поступления, а каждый вызывающий получает свой результат или ошибку,
+    как при последовательных вызовах методов PersonDB.
+
+    Вместо PersonDB можно использовать базу с тем же интерфейсом, например
+    DurablePersonDB, для которой пакет записей фиксируется в журнале одной
+    операцией, или ShardedPersonDB.
+
+    Когда очередь заполнена, новые запросы ожидают освобождения места.
+    """
+
+    def __init__(
+        self,
+        database: PersonDB,
+        max_pending: int = 1024,
+        max_batch: int = 256,
+        executor: Optional[Executor] = None,
+    ) -> None:
+        """
+        Инициализирует асинхронный интерфейс.
+
+        Args:
+            database: база данных, к которой выполняются запросы.
+            max_pending: размер очереди запросов. Значение по умолчанию - 1024.
+            max_batch: наибольшее число запросов в пакете. Значение по умолчанию - 256.
+            executor: пул, в котором выполняются пакеты. Значение по умолчанию - None,
+                пул цикла событий.
+
+        Raises:
+            ValueError, если max_pending или max_batch меньше единицы.
+        """
+        if max_pending < 1 or max_batch < 1:
+            raise ValueError("Размер очереди и пакета должен быть положительным.")
+
+        self._database = database
+        self._max_batch = max_batch
+        self._executor = executor
+        self._queue: asyncio.Queue = asyncio.Queue(max_pending)
+        self._worker: Optional[asyncio.Task] = None
+        self._closed = False
+
+    async def __aenter__(self) -> "AsyncPersonDB":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Выполняет принятые запросы и останавливает обработчик."""
+        if self._closed:
+            return
+
+        self._closed = True
+        if self._worker is not None:
+            await self._queue.put(None)
+            await self._worker
+
+    async def create_person(self, person: Person) -> UUID:
+        """Создает новую запись о пользователе в базе данных."""
+        return await self._submit("create_person", person)
+
+    async def create_many(self, persons: Iterable[Person]) -> list[UUID]:
+        """Создает записи о нескольких пользователях, см. PersonDB.create_many."""
+        return await self._submit("create_many", list(persons))
+
+    async def import_persons(
+        self, persons: Iterable[Person]
+    ) -> tuple[dict[int, UUID], ValidationReport]:
+        """Создает записи о валидных пользователях, см. PersonDB.import_persons."""
+        return await self._submit("import_persons", list(persons))
+
+    async def validate_many(self, persons: Iterable[Person]) -> ValidationReport:
+        """Проверяет записи о пользователях, см. PersonDB.validate_many."""
+        return await self._submit("validate_many", list(persons))
+
+    async def read_person_info(self, person_id: UUID) -> Person:
+        """Читает данные пользователя из базы данных по его UUID."""
+        return await self._submit("read_person_info", person_id)
+
+    async def read_many(self, person_ids: Iterable[UUID]) -> list[Person]:
+        """Читает данные нескольких пользователей, см. PersonDB.read_many."""
+        return await self._submit("read_many", list(person_ids))
+
+    async def find_persons(self, field: str, value: str) -> list[UUID]:
+        """Находит пользователей по точному значению поля, см. PersonDB.find_persons."""
+        return await self._submit("find_persons", field, value)
+
+    async def find_persons_by_prefix(self, field: str, prefix: str) -> list[UUID]:
+        """Находит пользователей по префиксу, см. PersonDB.find_persons_by_prefix."""
+        return await self._submit("find_persons_by_prefix", field, prefix)
+
+    async def update_person_info(self, person_id: UUID, person_info_new: Person) -> None:
+        """Обновляет данные о пользователе, см. PersonDB.update_person_info."""
+        return await self._submit("update_person_info", person_id, person_info_new)
+
+    async def delete_person(self, person_id: UUID) -> None:
+        """Удаляет запись о пользователе по его UUID."""
+        return await self._submit("delete_person", person_id)
+
+    async def delete_many(self, person_ids: Iterable[UUID]) -> None:
+        """Удаляет записи о нескольких пользователях, см. PersonDB.delete_many."""
+        return await self._submit("delete_many", list(person_ids))
+
+    async def _submit(self, method: str, *args: Any) -> Any:
+        if self._closed:
+            raise RuntimeError("База данных закрыта.")
+
+        loop = asyncio.get_running_loop()
+        if self._worker is None:
+            self._worker = loop.create_task(self._run())
+
+        future = loop.create_future()
+        await self._queue.put((method, args, future))
+        if self._worker.done():
+            # запрос попал в очередь после остановки обработчика
+            self._fail_pending()
+
+        return await future
+
+    async def _run(self) -> None:
+        while True:
+            requests = [await self._queue.get()]
+            while len(requests) < self._max_batch and not self._queue.empty():
+                requests.append(self._queue.get_nowait())
+
+            stop = None in requests
+            if stop:
+                requests = requests[:requests.index(None)]
+
+            # запросы, отмененные вызывающими, не выполняются
+            requests = [request for request in requests if not request[2].done()]
+            if requests:
+                await self._dispatch(requests)
+
+            if stop:
+                self._fail_pending()
+                return
+
+    async def _dispatch(self, requests: list[tuple[str, tuple, asyncio.Future]]) -> None:
+        try:
+            outcomes = await asyncio.get_running_loop().run_in_executor(
+                self._executor,
+                _execute,
+                self._database,
+                [(method, args) for method, args, _ in requests],
+            )
+        except Exception as error:
+            outcomes = [(False, error)] * len(requests)
+
+        for (_, _, future), (success, value) in zip(requests, outcomes):
+            if future.done():
+                continue
+            if success:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+
+    def _fail_pending(self) -> None:
+        while not self._queue.empty():
+            request = self._queue.get_nowait()
+            if request is not None and not request[2].done():
+                request[2].set_exception(RuntimeError("База данных закрыта."))
+
+# Пример тестирования
+if __name__ == "__main__":
+    async def main() -> None:
+        database = PersonDB(sorted_indexes=["username"])
+
+        async with AsyncPersonDB(database, max_pending=64) as async_database:
+            persons = [
+                Person(password="Aa1Bb2Cc3Dd4", login=f"login{i}", username=f"user#{i:03d}")
+                for i in range(500)
+            ]
+            person_ids = await asyncio.gather(
+                *(async_database.create_person(person) for person in persons)
+            )
+            assert await asyncio.gather(
+                *(async_database.read_person_info(person_id) for person_id in person_ids)
+            ) == persons
+
+            # одновременно создается один пользователь с логином
+            results = await asyncio.gather(
+                *(
+                    async_database.create_person(
+                        Person(password="Aa1Bb2Cc3Dd4", login="admin", username="x")
+                    )
+                    for _ in range(10)
+                ),
+                async_database.create_person(Person(password="abc", login="a", username="x")),
+                return_exceptions=True,
+            )
+            assert sum(isinstance(result, UUID) for result in results) == 1
+            assert sum(isinstance(result, ValueError) for result in results) == 10
+            # сообщение об ошибке то же, что и без объединения запросов
+            assert str(results[-1]) == VALIDATION_MESSAGES["password-too-short"]
+
+            # запросы выполняются в порядке поступления
+            results = await asyncio.gather(
+                async_database.delete_person(person_ids[0]),
+                async_database.read_person_info(person_ids[0]),
+                async_database.delete_person(person_ids[0]),
+                async_database.read_person_info(person_ids[1]),
+                return_exceptions=True,
+            )
+            assert results[0] is None and isinstance(results[1], KeyError)
+            assert isinstance(results[2], KeyError) and results[3] == persons[1]
+
+            # ошибка одного запроса пакета не передается остальным
+            results = await asyncio.gather(
+                async_database.update_person_info(
+                    person_ids[1], Person(password="", login="", username="root")
+                ),
+                async_database.create_person(
+                    Person(password="Aa1Bb2Cc3Dd4", login="bob", username="x")
+                ),
+                async_database.create_person(
+                    Person(password="Aa1Bb2Cc3Dd4", login=None, username="x")
+                ),
+                return_exceptions=True,
+            )
+            assert results[0] is None and isinstance(results[1], UUID)
+            assert isinstance(results[2], ValueError)
+            assert await async_database.find_persons_by_prefix("username", "ro") == [person_ids[1]]
+
+        try:
+            await async_database.read_person_info(person_ids[1])
+            assert False
+        except RuntimeError:
+            assert True
+
+    asyncio.run(main())
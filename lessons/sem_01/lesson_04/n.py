@@ -1,6 +1,11 @@
-from dataclasses import dataclass
-from uuid import UUID, uuid4
+import bisect
 import re
+import threading
+
+from contextlib import contextmanager
+from dataclasses import dataclass, fields
+from typing import Callable, Iterable, Iterator, Optional, Union
+from uuid import UUID, uuid4
 
 @dataclass
 class Person:
@@ -10,75 +15,514 @@ class Person:
     username: str
     metadata: str = ""
 
-class PersonDB:
+def _copy_person(person: Person) -> Person:
+    """Быстро копирует запись о пользователе, минуя __init__."""
+    copy = object.__new__(Person)
+    copy.__dict__.update(person.__dict__)
+    return copy
+
+# Поля Person, по которым можно построить вторичный индекс
+INDEXABLE_FIELDS = frozenset(field.name for field in fields(Person)) - {"password"}
+
+# Коды ошибок проверки записей и их описания
+VALIDATION_MESSAGES = {
+    "login-format": "Логин не должен быть пустым и должен содержать только буквы и цифры.",
+    "login-not-unique": "Логин должен быть уникальным.",
+    "password-too-short": "Пароль должен содержать не менее 10 символов.",
+    "password-no-upper": "Пароль должен содержать заглавную латинскую букву.",
+    "password-no-lower": "Пароль должен содержать строчную латинскую букву.",
+    "password-no-digits": "Пароль должен содержать цифру.",
+    "password-charset": "Пароль должен содержать только латинские буквы и цифры.",
+}
+
+PASSWORD_MIN_LENGTH = 10
+
+_LOGIN_PATTERN = re.compile(r'[A-Za-z0-9]+')
+# все требования к паролю проверяются одним шаблоном: опережающие проверки
+# вида [^A-Z]*[A-Z] не откатываются, поэтому проверка линейна
+_PASSWORD_PATTERN = re.compile(
+    rf'(?=[^A-Z]*[A-Z])(?=[^a-z]*[a-z])(?=[^0-9]*[0-9])[A-Za-z0-9]{{{PASSWORD_MIN_LENGTH},}}'
+)
+# отдельные требования к паролю для описания ошибок невалидных паролей
+_PASSWORD_RULES = [
+    ("password-no-upper", re.compile(r'[A-Z]').search),
+    ("password-no-lower", re.compile(r'[a-z]').search),
+    ("password-no-digits", re.compile(r'[0-9]').search),
+    ("password-charset", re.compile(r'[A-Za-z0-9]*').fullmatch),
+]
+
+def login_errors(login: str) -> list[str]:
+    """Возвращает коды ошибок формата логина. Логин, не являющийся строкой, невалиден."""
+    if isinstance(login, str) and _LOGIN_PATTERN.fullmatch(login):
+        return []
+    return ["login-format"]
+
+def password_errors(password: str) -> list[str]:
+    """Возвращает коды ошибок пароля. Пароль, не являющийся строкой, невалиден."""
+    if not isinstance(password, str):
+        return ["password-charset"]
+    if _PASSWORD_PATTERN.fullmatch(password):
+        return []
+
+    errors = ["password-too-short"] if len(password) < PASSWORD_MIN_LENGTH else []
+    errors.extend(code for code, check in _PASSWORD_RULES if not check(password))
+
+    return errors
+
+@dataclass
+class ValidationReport:
+    """
+    Результат пакетной проверки записей о пользователях.
+
+    Attrs:
+        total: число проверенных записей.
+        errors: коды ошибок (см. VALIDATION_MESSAGES) по номерам
+            невалидных записей.
+    """
+    total: int
+    errors: dict[int, list[str]]
+
+    @property
+    def is_valid(self) -> bool:
+        return not self.errors
+
+class BatchValidationError(ValueError):
+    """Ошибка пакетной операции с невалидными записями."""
+
+    def __init__(self, report: ValidationReport) -> None:
+        super().__init__(
+            f"Невалидных записей: {len(report.errors)} из {report.total}."
+        )
+        self.report = report
+
+    def __reduce__(self) -> tuple:
+        return type(self), (self.report,)
+
+class ReadWriteLock:
+    """
+    Блокировка с раздельным доступом на чтение и запись.
+
+    Читатели не блокируют друг друга, писатель получает монопольный доступ.
+    Ожидающий писатель не пропускает новых читателей, поэтому поток
+    чтения не может бесконечно откладывать запись. Блокировка не реентерабельна.
+    """
+
     def __init__(self) -> None:
-        """Инициализирует базу данных."""
+        self._condition = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = False
+        self._waiting_writers = 0
+
+    @contextmanager
+    def read(self) -> Iterator[None]:
+        """Захватывает блокировку на чтение."""
+        with self._condition:
+            while self._writer or self._waiting_writers:
+                self._condition.wait()
+            self._readers += 1
+
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._readers -= 1
+                if not self._readers:
+                    self._condition.notify_all()
+
+    @contextmanager
+    def write(self) -> Iterator[None]:
+        """Захватывает блокировку на запись."""
+        with self._condition:
+            self._waiting_writers += 1
+            while self._writer or self._readers:
+                self._condition.wait()
+            self._waiting_writers -= 1
+            self._writer = True
+
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._writer = False
+                self._condition.notify_all()
+
+class HashIndex:
+    """Хеш-индекс по полю пользователя: поиск по точному значению за O(1)."""
+
+    def __init__(self) -> None:
+        self._entries: dict[str, set[UUID]] = {}
+
+    def add(self, value: str, person_id: UUID) -> None:
+        self._entries.setdefault(value, set()).add(person_id)
+
+    def remove(self, value: str, person_id: UUID) -> None:
+        person_ids = self._entries[value]
+        person_ids.discard(person_id)
+        if not person_ids:
+            del self._entries[value]
+
+    def find(self, value: str) -> list[UUID]:
+        return list(self._entries.get(value, ()))
+
+class SortedIndex:
+    """
+    Упорядоченный индекс по полю пользователя.
+
+    Пары (значение, UUID) хранятся в отсортированном списке, поэтому поиск
+    по значению и по префиксу значения выполняется бинарным поиском
+    за O(log n + k), где k - число найденных пользователей.
+    """
+
+    def __init__(self) -> None:
+        self._entries: list[tuple[str, UUID]] = []
+
+    def add(self, value: str, person_id: UUID) -> None:
+        bisect.insort(self._entries, (value, person_id))
+
+    def add_many(self, entries: Iterable[tuple[str, UUID]]) -> None:
+        # сортировка слиянием использует уже упорядоченную часть списка,
+        # поэтому вставка k пар стоит O(n + k log k), а не O(n k)
+        self._entries.extend(entries)
+        self._entries.sort()
+
+    def remove(self, value: str, person_id: UUID) -> None:
+        del self._entries[bisect.bisect_left(self._entries, (value, person_id))]
+
+    def find(self, value: str) -> list[UUID]:
+        return [person_id for _, person_id in self._scan(value, lambda found: found == value)]
+
+    def find_prefix(self, prefix: str) -> list[UUID]:
+        return [
+            person_id for _, person_id in self._scan(prefix, lambda found: found.startswith(prefix))
+        ]
+
+    def _scan(
+        self, start: str, matches: Callable[[str], bool]
+    ) -> Iterator[tuple[str, UUID]]:
+        # кортеж (start,) меньше любой пары (start, UUID)
+        for index in range(bisect.bisect_left(self._entries, (start,)), len(self._entries)):
+            entry = self._entries[index]
+            if not matches(entry[0]):
+                return
+            yield entry
+
+class PersonDB:
+    """
+    База данных пользователей.
+
+    Помимо уникального индекса по логину база поддерживает вторичные
+    хеш-индексы (поиск по значению) и упорядоченные индексы (поиск по значению
+    и префиксу) по полям из INDEXABLE_FIELDS. Индексы обновляются при каждом
+    изменении данных. База хранит и возвращает копии записей, поэтому
+    изменение полученного объекта Person не нарушает индексы.
+
+    Все методы потокобезопасны: чтения выполняются параллельно,
+    изменения - монопольно.
+    """
+
+    def __init__(
+        self,
+        hash_indexes: Iterable[str] = (),
+        sorted_indexes: Iterable[str] = (),
+    ) -> None:
+        """
+        Инициализирует базу данных.
+
+        Args:
+            hash_indexes: поля, по которым строятся хеш-индексы.
+            sorted_indexes: поля, по которым строятся упорядоченные индексы.
+
+        Raises:
+            ValueError, если поле не входит в INDEXABLE_FIELDS.
+        """
         self._database: dict[UUID, Person] = {}
         self._login_registry: dict[str, UUID] = {}
+        self._lock = ReadWriteLock()
+        self._indexes: dict[str, list[Union[HashIndex, SortedIndex]]] = {}
+
+        for index_type, index_fields in ((HashIndex, hash_indexes), (SortedIndex, sorted_indexes)):
+            for field in index_fields:
+                if field not in INDEXABLE_FIELDS:
+                    raise ValueError(f"Поле {field!r} нельзя индексировать.")
+                self._indexes.setdefault(field, []).append(index_type())
 
     def _validate_login(self, login: str) -> None:
         """Проверяет, что логин валиден."""
-        if not login or not re.match(r'^[A-Za-z0-9]+$', login):
-            raise ValueError("Логин не должен быть пустым и должен содержать только буквы и цифры.")
+        if login_errors(login):
+            raise ValueError(VALIDATION_MESSAGES["login-format"])
         if login in self._login_registry:
-            raise ValueError("Логин должен быть уникальным.")
+            raise ValueError(VALIDATION_MESSAGES["login-not-unique"])
 
     def _validate_password(self, password: str) -> None:
-        """Проверяет, что пароль валиден."""
-        if (len(password) < 10 or
-            not re.search(r'[A-Z]', password) or
-            not re.search(r'[a-z]', password) or
-            not re.search(r'[0-9]', password) or
-            not re.match(r'^[A-Za-z0-9]+$', password)):
-            raise ValueError("Пароль не соответствует требованиям.")
+        """Проверяет, что пароль валиден, и описывает первое нарушенное требование."""
+        errors = password_errors(password)
+        if errors:
+            raise ValueError(VALIDATION_MESSAGES[errors[0]])
 
-    def create_person(self, person: Person) -> UUID:
-        """Создает новую запись о пользователе в базе данных."""
-        self._validate_login(person.login)
-        self._validate_password(person.password)
-        
-        person_id = uuid4()
-        self._database[person_id] = person
+    def _validate_batch(self, persons: list[Person]) -> ValidationReport:
+        """Проверяет записи, собирая все ошибки каждой записи."""
+        errors = {}
+        logins = set()
+
+        for number, person in enumerate(persons):
+            record_errors = login_errors(person.login)
+            if isinstance(person.login, str) and (
+                person.login in self._login_registry or person.login in logins
+            ):
+                record_errors.append("login-not-unique")
+            record_errors.extend(password_errors(person.password))
+
+            if record_errors:
+                errors[number] = record_errors
+            if isinstance(person.login, str):
+                logins.add(person.login)
+
+        return ValidationReport(len(persons), errors)
+
+    def _index(self, person_id: UUID, person: Person) -> None:
+        """Добавляет пользователя во все индексы."""
         self._login_registry[person.login] = person_id
-        
+        for field, indexes in self._indexes.items():
+            for index in indexes:
+                index.add(getattr(person, field), person_id)
+
+    def _unindex(self, person_id: UUID, person: Person) -> None:
+        """Удаляет пользователя из всех индексов."""
+        del self._login_registry[person.login]
+        for field, indexes in self._indexes.items():
+            for index in indexes:
+                index.remove(getattr(person, field), person_id)
+
+    def _log(self, operation: str, person_id: UUID, data: dict[str, str]) -> None:
+        """
+        Фиксирует изменение базы данных.
+
+        Вызывается под блокировкой на запись после каждого изменения
+        в порядке применения: operation - "create", "update" или "delete",
+        data - поля созданной записи или измененные поля. База в памяти
+        изменения не фиксирует, наследники могут записывать их в журнал.
+        """
+
+    def _index_many(self, persons: list[tuple[UUID, Person]]) -> None:
+        """Добавляет нескольких пользователей во все индексы."""
+        self._login_registry.update((person.login, person_id) for person_id, person in persons)
+        for field, indexes in self._indexes.items():
+            for index in indexes:
+                if isinstance(index, SortedIndex):
+                    index.add_many(
+                        (getattr(person, field), person_id) for person_id, person in persons
+                    )
+                    continue
+                for person_id, person in persons:
+                    index.add(getattr(person, field), person_id)
+
+    def _insert_many(
+        self, persons: list[Person], person_ids: Optional[list[UUID]] = None
+    ) -> list[UUID]:
+        """Добавляет проверенные записи о нескольких пользователях."""
+        person_ids = person_ids or [uuid4() for _ in persons]
+        inserted = [
+            (person_id, _copy_person(person)) for person_id, person in zip(person_ids, persons)
+        ]
+        self._database.update(inserted)
+        self._index_many(inserted)
+        for person_id, person in inserted:
+            self._log("create", person_id, vars(person))
+
+        return [person_id for person_id, _ in inserted]
+
+    def _insert(self, person: Person, person_id: Optional[UUID] = None) -> UUID:
+        """Добавляет проверенную запись о пользователе."""
+        person_id = person_id or uuid4()
+        person = _copy_person(person)
+        self._database[person_id] = person
+        self._index(person_id, person)
+        self._log("create", person_id, vars(person))
+
         return person_id
-    
-    def read_person_info(self, person_id: UUID) -> Person:
-        """Читает данные пользователя из базы данных по его UUID."""
+
+    def _change(self, person_id: UUID, changes: dict[str, str]) -> None:
+        """Применяет проверенные изменения полей записи о пользователе."""
+        current_person = self._database[person_id]
+
+        if "login" in changes:
+            del self._login_registry[current_person.login]
+            self._login_registry[changes["login"]] = person_id
+
+        for field, value in changes.items():
+            for index in self._indexes.get(field, ()):
+                index.remove(getattr(current_person, field), person_id)
+                index.add(value, person_id)
+            setattr(current_person, field, value)
+
+        self._log("update", person_id, changes)
+
+    def _remove(self, person_id: UUID) -> None:
+        """Удаляет существующую запись о пользователе."""
+        self._unindex(person_id, self._database.pop(person_id))
+        self._log("delete", person_id, {})
+
+    def _get(self, person_id: UUID) -> Person:
+        """Возвращает хранимую запись о пользователе."""
         if person_id not in self._database:
             raise KeyError("Пользователь не найден.")
         return self._database[person_id]
 
+    def create_person(self, person: Person) -> UUID:
+        """Создает новую запись о пользователе в базе данных."""
+        with self._lock.write():
+            self._validate_login(person.login)
+            self._validate_password(person.password)
+
+            return self._insert(person)
+
+    def validate_many(self, persons: Iterable[Person]) -> ValidationReport:
+        """
+        Проверяет записи о пользователях, не изменяя базу данных.
+
+        В отличие от create_person, проверка не останавливается на первой
+        ошибке: для каждой записи собираются все нарушенные требования.
+        Логин, повторяющийся внутри пакета, считается неуникальным
+        во всех записях, кроме первой.
+        """
+        persons = list(persons)
+
+        with self._lock.read():
+            return self._validate_batch(persons)
+
+    def create_many(self, persons: Iterable[Person]) -> list[UUID]:
+        """
+        Создает записи о нескольких пользователях.
+
+        Записи создаются атомарно: если хотя бы одна запись невалидна
+        или логины повторяются, не создается ни одной записи.
+
+        Returns:
+            Список UUID в порядке persons.
+
+        Raises:
+            BatchValidationError, если хотя бы одна запись невалидна.
+        """
+        persons = list(persons)
+
+        with self._lock.write():
+            report = self._validate_batch(persons)
+            if not report.is_valid:
+                raise BatchValidationError(report)
+
+            return self._insert_many(persons)
+
+    def import_persons(
+        self, persons: Iterable[Person]
+    ) -> tuple[dict[int, UUID], ValidationReport]:
+        """
+        Создает записи о валидных пользователях, пропуская невалидные.
+
+        Returns:
+            Пару: UUID созданных записей по их номерам в persons
+            и отчет о проверке всех записей.
+        """
+        persons = list(persons)
+
+        with self._lock.write():
+            report = self._validate_batch(persons)
+            numbers = [number for number in range(len(persons)) if number not in report.errors]
+            person_ids = self._insert_many([persons[number] for number in numbers])
+            created = dict(zip(numbers, person_ids))
+
+        return created, report
+
+    def read_person_info(self, person_id: UUID) -> Person:
+        """Читает данные пользователя из базы данных по его UUID."""
+        with self._lock.read():
+            return _copy_person(self._get(person_id))
+
+    def read_many(self, person_ids: Iterable[UUID]) -> list[Person]:
+        """
+        Читает данные нескольких пользователей.
+
+        Raises:
+            KeyError, если хотя бы один пользователь не найден.
+        """
+        with self._lock.read():
+            return [_copy_person(self._get(person_id)) for person_id in person_ids]
+
+    def find_persons(self, field: str, value: str) -> list[UUID]:
+        """
+        Находит пользователей по точному значению поля с помощью индекса.
+
+        Raises:
+            ValueError, если по полю нет индекса.
+        """
+        with self._lock.read():
+            if field == "login":
+                return [self._login_registry[value]] if value in self._login_registry else []
+            if field not in self._indexes:
+                raise ValueError(f"Нет индекса по полю {field!r}.")
+            return self._indexes[field][0].find(value)
+
+    def find_persons_by_prefix(self, field: str, prefix: str) -> list[UUID]:
+        """
+        Находит пользователей по префиксу значения поля, упорядоченных по значению.
+
+        Raises:
+            ValueError, если по полю нет упорядоченного индекса.
+        """
+        with self._lock.read():
+            for index in self._indexes.get(field, ()):
+                if isinstance(index, SortedIndex):
+                    return index.find_prefix(prefix)
+            raise ValueError(f"Нет упорядоченного индекса по полю {field!r}.")
+
     def update_person_info(self, person_id: UUID, person_info_new: Person) -> None:
-        """Обновляет данные о пользователе по его UUID."""
-        if person_id not in self._database:
-            raise KeyError("Пользователь не найден.")
-        
-        current_person = self._database[person_id]
+        """
+        Обновляет данные о пользователе по его UUID.
 
-        if person_info_new.login and person_info_new.login != current_person.login:
-            self._validate_login(person_info_new.login)
-            del self._login_registry[current_person.login]
-            self._login_registry[person_info_new.login] = person_id
-            current_person.login = person_info_new.login
-        
-        if person_info_new.password:
-            self._validate_password(person_info_new.password)
-            current_person.password = person_info_new.password
-        
-        if person_info_new.username:
-            current_person.username = person_info_new.username
-        
-        if person_info_new.metadata:
-            current_person.metadata = person_info_new.metadata
+        Пустые поля person_info_new не изменяются. Все изменения проверяются
+        до применения, поэтому при ошибке запись остается прежней.
+        """
+        with self._lock.write():
+            current_person = self._get(person_id)
+
+            if person_info_new.login and person_info_new.login != current_person.login:
+                self._validate_login(person_info_new.login)
+
+            if person_info_new.password:
+                self._validate_password(person_info_new.password)
+
+            changes = {
+                field: value
+                for field, value in vars(person_info_new).items()
+                if value and value != getattr(current_person, field)
+            }
+
+            if changes:
+                self._change(person_id, changes)
 
     def delete_person(self, person_id: UUID) -> None:
         """Удаляет запись о пользователе по его UUID."""
-        if person_id not in self._database:
-            raise KeyError("Пользователь не найден.")
-        
-        deleted_person = self._database.pop(person_id)
-        del self._login_registry[deleted_person.login]
+        with self._lock.write():
+            self._get(person_id)
+            self._remove(person_id)
+
+    def delete_many(self, person_ids: Iterable[UUID]) -> None:
+        """
+        Удаляет записи о нескольких пользователях.
+
+        Записи удаляются атомарно: если хотя бы один пользователь
+        не найден, не удаляется ни одной записи.
+
+        Raises:
+            KeyError, если хотя бы один пользователь не найден.
+        """
+        person_ids = set(person_ids)
+
+        with self._lock.write():
+            for person_id in person_ids:
+                self._get(person_id)
+
+            for person_id in person_ids:
+                self._remove(person_id)
 
 # Пример тестирования
 if __name__ == "__main__":
@@ -166,4 +610,60 @@ if __name__ == "__main__":
     assert len(database._database) == 1
     assert len(database._login_registry) == 1
     assert person2_id not in database._database
-    assert "LOGIN2" not in database._login_registry
\ No newline at end of file
+    assert "LOGIN2" not in database._login_registry
+
+    # Вторичные индексы и пакетные операции
+    database = PersonDB(hash_indexes=["username"], sorted_indexes=["username", "metadata"])
+    persons = [
+        Person(password="Aa1Bb2Cc3Dd4", login=f"login{i}", username=f"user#{i % 3}")
+        for i in range(6)
+    ]
+    person_ids = database.create_many(persons)
+
+    assert database.read_many(person_ids) == persons
+    assert sorted(database.find_persons("username", "user#1")) == sorted(person_ids[1::3])
+    assert len(database.find_persons_by_prefix("username", "user#")) == 6
+    assert database.find_persons("login", "login4") == [person_ids[4]]
+
+    try:
+        database.create_many([Person(password="Aa1Bb2Cc3Dd4", login="new", username="u")] * 2)
+        assert False
+    except ValueError:
+        assert len(database._database) == 6
+
+    database.update_person_info(person_ids[0], Person(password="", login="", username="admin"))
+    assert database.find_persons("username", "admin") == [person_ids[0]]
+    assert database.find_persons_by_prefix("username", "adm") == [person_ids[0]]
+    assert person_ids[0] not in database.find_persons("username", "user#0")
+
+    database.delete_many(person_ids[:3])
+    assert len(database._database) == 3
+    assert database.find_persons("username", "admin") == []
+    assert len(database.find_persons_by_prefix("metadata", "")) == 3
+
+    # Пакетная проверка записей
+    report = database.validate_many([
+        Person(password="Aa1Bb2Cc3Dd4", login="login3", username="user#3"),
+        Person(password="Aa1Bb2Cc3Dd4", login="fresh", username="user#3"),
+        Person(password="abc", login="bad login", username="user#3"),
+        Person(password="Aa1Bb2Cc3Dd4", login="fresh", username="user#3"),
+    ])
+    assert report.total == 4
+    assert report.errors == {
+        0: ["login-not-unique"],
+        2: ["login-format", "password-too-short", "password-no-upper", "password-no-digits"],
+        3: ["login-not-unique"],
+    }
+
+    try:
+        database.create_many([Person(password="abc", login="fresh", username="user#3")])
+        assert False
+    except BatchValidationError as error:
+        assert list(error.report.errors) == [0]
+
+    created, report = database.import_persons([
+        Person(password="Aa1Bb2Cc3Dd4", login="fresh", username="user#3"),
+        Person(password="Aa1Bb2Cc3Dd4x", login="fresh", username="user#4"),
+    ])
+    assert list(created) == [0] and list(report.errors) == [1]
+    assert database.find_persons("login", "fresh") == [created[0]]
@@ -0,0 +1,603 @@
+import json
+import mmap
+import os
+import struct
+import threading
+import zlib
+
+from typing import Iterable, Iterator, Optional, Union
+from uuid import UUID
+
+from n import Person, PersonDB, ValidationReport
+
+# Заголовок записи журнала: длина данных, номер записи, контрольная сумма данных
+_RECORD_HEADER = struct.Struct("<IQI")
+# Заголовок снимка: сигнатура, номер последней учтенной записи журнала,
+# число пользователей, контрольная сумма данных
+_SNAPSHOT_HEADER = struct.Struct("<4sQQI")
+_SNAPSHOT_MAGIC = b"PDB1"
+# Пользователь в снимке: UUID и длины логина, пароля, имени и метаданных в байтах
+_SNAPSHOT_RECORD = struct.Struct("<16sIIII")
+_SNAPSHOT_FILE = "snapshot.bin"
+_SEGMENT_PREFIX = "wal-"
+_SEGMENT_SUFFIX = ".log"
+
+def _fsync_directory(directory: str) -> None:
+    """Фиксирует на диске создание и удаление файлов в каталоге."""
+    try:
+        descriptor = os.open(directory, os.O_RDONLY)
+    except OSError:
+        # каталоги нельзя открыть, например, в Windows
+        return
+    try:
+        os.fsync(descriptor)
+    finally:
+        os.close(descriptor)
+
+def _segment_path(directory: str, start: int) -> str:
+    return os.path.join(directory, f"{_SEGMENT_PREFIX}{start:020d}{_SEGMENT_SUFFIX}")
+
+def _segments(directory: str) -> list[tuple[int, str]]:
+    """Возвращает сегменты журнала в каталоге в порядке номеров первых записей."""
+    segments = []
+    for name in os.listdir(directory):
+        if name.startswith(_SEGMENT_PREFIX) and name.endswith(_SEGMENT_SUFFIX):
+            start = int(name[len(_SEGMENT_PREFIX):-len(_SEGMENT_SUFFIX)])
+            segments.append((start, os.path.join(directory, name)))
+    return sorted(segments)
+
+def _read_segment(path: str) -> Iterator[tuple[int, bytes, int]]:
+    """
+    Читает записи сегмента журнала через отображение файла в память.
+
+    Для каждой записи возвращает ее номер, данные и смещение конца записи.
+    Чтение останавливается на первой неполной или поврежденной записи:
+    такая запись могла быть не дописана при аварийном завершении
+    и не была подтверждена.
+    """
+    with open(path, "rb") as file:
+        if not os.fstat(file.fileno()).st_size:
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            offset = 0
+            while offset + _RECORD_HEADER.size <= len(mapped):
+                length, lsn, checksum = _RECORD_HEADER.unpack_from(mapped, offset)
+                start = offset + _RECORD_HEADER.size
+                payload = mapped[start:start + length]
+                if len(payload) < length or zlib.crc32(payload) != checksum:
+                    return
+                offset = start + length
+                yield lsn, payload, offset
+
+def _truncate_segment(path: str, size: int) -> None:
+    """Отрезает от сегмента журнала все после первых size байт."""
+    with open(path, "r+b") as file:
+        file.truncate(size)
+        file.flush()
+        os.fsync(file.fileno())
+
+class WriteAheadLog:
+    """
+    Журнал упреждающей записи с групповой фиксацией.
+
+    Записи добавляются в буфер в памяти, а фоновый поток дописывает
+    накопленные записи в файл и вызывает fsync один раз на весь пакет:
+    записи, добавленные во время предыдущего fsync, фиксируются следующим.
+    Каждой записи присваивается возрастающий номер (LSN). Журнал делится
+    на сегменты wal-<номер первой записи>.log, новый сегмент начинается
+    после вызова rotate.
+    """
+
+    def __init__(self, directory: str, next_lsn: int, commit_interval: float) -> None:
+        """
+        Открывает журнал, начиная новый сегмент.
+
+        Args:
+            directory: каталог сегментов.
+            next_lsn: номер следующей записи.
+            commit_interval: время в секундах, в течение которого фоновый поток
+                накапливает записи, если их фиксации никто не ждет.
+        """
+        self._directory = directory
+        self._commit_interval = commit_interval
+        self._condition = threading.Condition()
+        # записи и номера первых записей новых сегментов в порядке добавления
+        self._pending: list[Union[bytes, int]] = []
+        self._appended_lsn = next_lsn - 1
+        self._durable_lsn = next_lsn - 1
+        self._segment_start = next_lsn
+        self._waiters = 0
+        self._closed = False
+        self._error: Optional[BaseException] = None
+
+        self._file = open(_segment_path(directory, next_lsn), "ab")
+        _fsync_directory(directory)
+        self._thread = threading.Thread(target=self._run, name="wal-writer", daemon=True)
+        self._thread.start()
+
+    @property
+    def appended_lsn(self) -> int:
+        """Номер последней добавленной записи."""
+        return self._appended_lsn
+
+    def append(self, payload: bytes) -> int:
+        """Добавляет запись в журнал и возвращает ее номер, не дожидаясь фиксации."""
+        with self._condition:
+            if self._closed:
+                raise ValueError("Журнал закрыт.")
+            self._appended_lsn += 1
+            self._pending.append(
+                _RECORD_HEADER.pack(len(payload), self._appended_lsn, zlib.crc32(payload)) + payload
+            )
+            self._condition.notify_all()
+            return self._appended_lsn
+
+    def rotate(self) -> int:
+        """Начинает новый сегмент и возвращает номер его первой записи."""
+        with self._condition:
+            start = self._appended_lsn + 1
+            self._pending.append(start)
+            self._condition.notify_all()
+            return start
+
+    def check(self) -> None:
+        """
+        Проверяет, что журнал исправен.
+
+        Raises:
+            OSError, если фоновый поток не смог записать журнал.
+        """
+        if self._error:
+            raise OSError("Не удалось записать журнал.") from self._error
+
+    def sync(self, lsn: Optional[int] = None, segment: Optional[int] = None) -> None:
+        """
+        Ожидает фиксации записей на диске.
+
+        Args:
+            lsn: номер записи, до которой включительно нужно дождаться
+                фиксации. Значение по умолчанию - None, последняя добавленная.
+            segment: номер первой записи сегмента, переход на который
+                нужно дождаться. Значение по умолчанию - None.
+
+        Raises:
+            OSError, если фоновый поток не смог записать журнал.
+        """
+        with self._condition:
+            lsn = self._appended_lsn if lsn is None else lsn
+            segment = segment or 0
+            self._waiters += 1
+            self._condition.notify_all()
+            try:
+                while not self._error and (
+                    self._durable_lsn < lsn or self._segment_start < segment
+                ):
+                    self._condition.wait()
+            finally:
+                self._waiters -= 1
+            self.check()
+
+    def close(self) -> None:
+        """Фиксирует все записи и закрывает журнал."""
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join()
+        self._file.close()
+        self.check()
+
+    def _run(self) -> None:
+        """Записывает накопленные записи пакетами."""
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending or self._closed)
+                if not self._pending:
+                    return
+                if not self._waiters and not self._closed:
+                    # фиксации никто не ждет: копим записи, чтобы
+                    # сделать один fsync на больший пакет
+                    self._condition.wait_for(
+                        lambda: self._waiters or self._closed, self._commit_interval
+                    )
+                batch, self._pending = self._pending, []
+                lsn = self._appended_lsn
+
+            try:
+                self._write(batch)
+            except BaseException as error:
+                with self._condition:
+                    self._error = error
+                    self._condition.notify_all()
+                return
+
+            with self._condition:
+                self._durable_lsn = lsn
+                self._condition.notify_all()
+
+    def _write(self, batch: list[Union[bytes, int]]) -> None:
+        for entry in batch:
+            if isinstance(entry, bytes):
+                self._file.write(entry)
+                continue
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+            self._file = open(_segment_path(self._directory, entry), "ab")
+            _fsync_directory(self._directory)
+            with self._condition:
+                self._segment_start = entry
+
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+class DurablePersonDB(PersonDB):
+    """
+    База данных пользователей, сохраняемая на диск.
+
+    Каждое изменение записывается в журнал упреждающей записи. Журнал
+    фиксируется на диске пакетами (групповая фиксация), поэтому параллельные
+    изменения разделяют один fsync, а пакетные операции ждут фиксации один раз.
+    Периодически база сохраняет сжатый снимок всех записей и удаляет сегменты
+    журнала, которые в нем учтены. При открытии снимок отображается в память,
+    а из журнала повторяются только записи, сделанные после снимка.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        hash_indexes: Iterable[str] = (),
+        sorted_indexes: Iterable[str] = (),
+        synchronous: bool = True,
+        commit_interval: float = 0.005,
+        snapshot_every: Optional[int] = 100_000,
+    ) -> None:
+        """
+        Открывает базу данных, восстанавливая ее из каталога.
+
+        Args:
+            directory: каталог со снимком и журналом. Создается, если не существует.
+            hash_indexes: поля, по которым строятся хеш-индексы.
+            sorted_indexes: поля, по которым строятся упорядоченные индексы.
+            synchronous: ждать ли фиксации изменения на диске перед возвратом
+                из метода. Если False, изменения фиксируются в фоне не позже
+                чем через commit_interval секунд и могут быть потеряны при сбое.
+            commit_interval: время накопления записей журнала в секундах
+                для асинхронной фиксации.
+            snapshot_every: число записей журнала, после которого сохраняется
+                новый снимок. None - снимки сохраняются только вызовом snapshot.
+        """
+        super().__init__(hash_indexes, sorted_indexes)
+        os.makedirs(directory, exist_ok=True)
+
+        self._directory = directory
+        self._synchronous = synchronous
+        self._snapshot_every = snapshot_every
+        self._snapshot_lock = threading.Lock()
+        self._wal: Optional[WriteAheadLog] = None
+        self._records_since_snapshot = 0
+        self._closed = False
+
+        last_lsn = self._recover()
+        self._wal = WriteAheadLog(directory, last_lsn + 1, commit_interval)
+
+    def __enter__(self) -> "DurablePersonDB":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Фиксирует все изменения и закрывает журнал."""
+        self._closed = True
+        self._wal.close()
+
+    def flush(self) -> None:
+        """Ожидает фиксации всех изменений на диске."""
+        self._wal.sync()
+
+    def create_person(self, person: Person) -> UUID:
+        self._check_writable()
+        person_id = super().create_person(person)
+        self._commit()
+        return person_id
+
+    def create_many(self, persons: Iterable[Person]) -> list[UUID]:
+        self._check_writable()
+        person_ids = super().create_many(persons)
+        self._commit()
+        return person_ids
+
+    def import_persons(
+        self, persons: Iterable[Person]
+    ) -> tuple[dict[int, UUID], ValidationReport]:
+        self._check_writable()
+        result = super().import_persons(persons)
+        self._commit()
+        return result
+
+    def update_person_info(self, person_id: UUID, person_info_new: Person) -> None:
+        self._check_writable()
+        super().update_person_info(person_id, person_info_new)
+        self._commit()
+
+    def delete_person(self, person_id: UUID) -> None:
+        self._check_writable()
+        super().delete_person(person_id)
+        self._commit()
+
+    def delete_many(self, person_ids: Iterable[UUID]) -> None:
+        self._check_writable()
+        super().delete_many(person_ids)
+        self._commit()
+
+    def snapshot(self, blocking: bool = True) -> bool:
+        """
+        Сохраняет снимок базы данных и удаляет учтенные в нем сегменты журнала.
+
+        Записи копируются под блокировкой на чтение, а кодируются и пишутся
+        на диск уже без нее. Снимок записывается во временный файл, который
+        атомарно заменяет предыдущий снимок.
+
+        Args:
+            blocking: ждать ли завершения снимка, сохраняемого другим потоком.
+
+        Returns:
+            True, если снимок сохранен, False, если снимок уже сохраняется
+            другим потоком и blocking равен False.
+
+        Raises:
+            ValueError, если база данных закрыта.
+            OSError, если не удалось записать снимок или журнал.
+        """
+        self._check_writable()
+        if not self._snapshot_lock.acquire(blocking):
+            return False
+
+        try:
+            with self._lock.read():
+                rows = [
+                    (person_id.bytes, *vars(person).values())
+                    for person_id, person in self._database.items()
+                ]
+                lsn = self._wal.appended_lsn
+                segment = self._wal.rotate()
+                self._records_since_snapshot = 0
+
+            self._write_snapshot(rows, lsn)
+            self._wal.sync(lsn, segment)
+
+            for start, path in _segments(self._directory):
+                if start < segment:
+                    os.remove(path)
+            _fsync_directory(self._directory)
+
+            return True
+        finally:
+            self._snapshot_lock.release()
+
+    def _check_writable(self) -> None:
+        """
+        Проверяет до изменения базы, что изменение можно записать в журнал.
+
+        Raises:
+            ValueError, если база данных закрыта.
+            OSError, если фоновый поток не смог записать журнал.
+        """
+        if self._closed:
+            raise ValueError("База данных закрыта.")
+        self._wal.check()
+
+    def _log(self, operation: str, person_id: UUID, data: dict[str, str]) -> None:
+        if self._wal is None:
+            # база восстанавливается из снимка и журнала
+            return
+        self._wal.append(json.dumps([operation, person_id.hex, data]).encode())
+        self._records_since_snapshot += 1
+
+    def _commit(self) -> None:
+        """
+        Дожидается фиксации изменений и при необходимости сохраняет снимок.
+
+        Ошибка сохранения снимка не передается вызывающему: изменение уже
+        зафиксировано в журнале, а снимок будет сохранен позже.
+        """
+        if self._synchronous:
+            self._wal.sync()
+        if self._snapshot_every and self._records_since_snapshot >= self._snapshot_every:
+            try:
+                self.snapshot(blocking=False)
+            except Exception:
+                pass
+
+    def _write_snapshot(self, rows: list[tuple], lsn: int) -> None:
+        """Записывает снимок на диск."""
+        chunks = []
+        for person_id, *fields in rows:
+            encoded = [field.encode() for field in fields]
+            chunks.append(_SNAPSHOT_RECORD.pack(person_id, *map(len, encoded)))
+            chunks.extend(encoded)
+        body = b"".join(chunks)
+
+        path = os.path.join(self._directory, _SNAPSHOT_FILE)
+        temporary = f"{path}.tmp"
+        with open(temporary, "wb") as file:
+            file.write(_SNAPSHOT_HEADER.pack(_SNAPSHOT_MAGIC, lsn, len(rows), zlib.crc32(body)))
+            file.write(body)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary, path)
+        _fsync_directory(self._directory)
+
+    def _recover(self) -> int:
+        """
+        Восстанавливает базу из снимка и журнала и возвращает номер последней записи.
+
+        Неполная или поврежденная запись в конце последнего сегмента не была
+        подтверждена: сегмент обрезается до последней целой записи, чтобы
+        новые записи журнала не оказались после мусора.
+
+        Raises:
+            ValueError, если снимок или журнал поврежден: в журнале пропущены
+            номера записей или поврежденная запись находится не в конце
+            последнего сегмента. Файлы в этом случае не изменяются.
+        """
+        snapshot_lsn = self._load_snapshot()
+        last_lsn = snapshot_lsn
+        segments = _segments(self._directory)
+        torn_size = None
+
+        for number, (start, path) in enumerate(segments):
+            if start > last_lsn + 1:
+                raise ValueError(f"В журнале пропущены записи перед сегментом {path}.")
+
+            valid_size = 0
+            for lsn, payload, end in _read_segment(path):
+                if lsn > last_lsn + 1:
+                    raise ValueError(f"В сегменте журнала {path} пропущены записи.")
+                if lsn == last_lsn + 1:
+                    operation, person_id, data = json.loads(payload)
+                    self._replay(operation, UUID(hex=person_id), data)
+                    last_lsn = lsn
+                valid_size = end
+
+            if valid_size < os.path.getsize(path):
+                if number < len(segments) - 1:
+                    raise ValueError(f"Сегмент журнала {path} поврежден.")
+                torn_size = valid_size
+
+        if torn_size is not None:
+            _truncate_segment(segments[-1][1], torn_size)
+
+        self._records_since_snapshot = last_lsn - snapshot_lsn
+        return last_lsn
+
+    def _replay(self, operation: str, person_id: UUID, data: dict[str, str]) -> None:
+        """Повторяет изменение из журнала."""
+        if operation == "create":
+            self._insert(Person(**data), person_id)
+        elif operation == "update":
+            self._change(person_id, data)
+        elif operation == "delete":
+            self._remove(person_id)
+        else:
+            raise ValueError(f"Неизвестная операция журнала {operation!r}.")
+
+    def _load_snapshot(self) -> int:
+        """
+        Загружает снимок, отображая его в память, и возвращает номер
+        последней учтенной в нем записи журнала.
+
+        Raises:
+            ValueError, если снимок поврежден.
+        """
+        path = os.path.join(self._directory, _SNAPSHOT_FILE)
+        if not os.path.exists(path):
+            return 0
+
+        with open(path, "rb") as file, mmap.mmap(
+            file.fileno(), 0, access=mmap.ACCESS_READ
+        ) as mapped:
+            magic, lsn, count, checksum = _SNAPSHOT_HEADER.unpack_from(mapped)
+            with memoryview(mapped) as view:
+                body_checksum = zlib.crc32(view[_SNAPSHOT_HEADER.size:])
+                valid = magic == _SNAPSHOT_MAGIC and body_checksum == checksum
+            if not valid:
+                raise ValueError(f"Снимок {path} поврежден.")
+
+            persons = []
+            offset = _SNAPSHOT_HEADER.size
+            for _ in range(count):
+                person_id, *lengths = _SNAPSHOT_RECORD.unpack_from(mapped, offset)
+                offset += _SNAPSHOT_RECORD.size
+                fields = []
+                for length in lengths:
+                    fields.append(mapped[offset:offset + length].decode())
+                    offset += length
+                persons.append((UUID(bytes=person_id), Person(*fields)))
+
+        self._database.update(persons)
+        self._index_many(persons)
+
+        return lsn
+
+# Пример тестирования
+if __name__ == "__main__":
+    import tempfile
+
+    directory = tempfile.mkdtemp()
+
+    with DurablePersonDB(directory, sorted_indexes=["username"]) as database:
+        person_ids = database.create_many(
+            Person(password="Aa1Bb2Cc3Dd4", login=f"login{i}", username=f"user#{i}")
+            for i in range(10)
+        )
+        database.snapshot()
+        database.update_person_info(person_ids[0], Person(password="", login="admin", username=""))
+        database.delete_person(person_ids[1])
+
+    # Снимок содержит 10 пользователей, журнал после него - два изменения
+    with DurablePersonDB(directory, sorted_indexes=["username"]) as database:
+        assert len(database._database) == 9
+        assert database.read_person_info(person_ids[0]).login == "admin"
+        assert database.find_persons("login", "login0") == []
+        assert len(database.find_persons_by_prefix("username", "user#")) == 9
+        assert database._records_since_snapshot == 2
+
+        database.snapshot()
+        assert len(_segments(directory)) == 1
+
+        database.create_person(Person(password="Aa1Bb2Cc3Dd4", login="first", username="x"))
+
+    # Оборванная запись в начале сегмента отрезается при восстановлении,
+    # и следующие записи журнала не теряются
+    with DurablePersonDB(directory) as database:
+        database.create_person(Person(password="Aa1Bb2Cc3Dd4", login="torn", username="x"))
+    path = _segments(directory)[-1][1]
+    _truncate_segment(path, os.path.getsize(path) - 10)
+
+    with DurablePersonDB(directory) as database:
+        assert database.find_persons("login", "torn") == []
+        database.create_person(Person(password="Aa1Bb2Cc3Dd4", login="acked", username="x"))
+
+    with DurablePersonDB(directory) as database:
+        assert len(database.find_persons("login", "first")) == 1
+        assert len(database.find_persons("login", "acked")) == 1
+
+    # Если снимок утерян, журнал начинается не с первой записи: база
+    # не открывается, а подтвержденные записи журнала не удаляются
+    directory = tempfile.mkdtemp()
+    with DurablePersonDB(directory) as database:
+        database.create_person(Person(password="Aa1Bb2Cc3Dd4", login="old", username="x"))
+        database.snapshot()
+        database.create_person(Person(password="Aa1Bb2Cc3Dd4", login="new", username="x"))
+    os.remove(os.path.join(directory, _SNAPSHOT_FILE))
+    sizes = [os.path.getsize(path) for _, path in _segments(directory)]
+
+    try:
+        DurablePersonDB(directory)
+        assert False
+    except ValueError:
+        assert [os.path.getsize(path) for _, path in _segments(directory)] == sizes
+        assert sizes[-1] > 0
+
+    # Закрытая база не изменяется, а ошибка фонового снимка не отменяет записи
+    directory = tempfile.mkdtemp()
+    database = DurablePersonDB(directory, snapshot_every=1)
+
+    def fail_snapshot(rows: list[tuple], lsn: int) -> None:
+        raise OSError("Диск заполнен.")
+
+    database._write_snapshot = fail_snapshot
+    person_id = database.create_person(Person(password="Aa1Bb2Cc3Dd4", login="kept", username="x"))
+    database.close()
+
+    try:
+        database.create_person(Person(password="Aa1Bb2Cc3Dd4", login="late", username="x"))
+        assert False
+    except ValueError:
+        assert database.find_persons("login", "late") == []
+
+    with DurablePersonDB(directory) as database:
+        assert database.read_person_info(person_id).login == "kept"
@@ -0,0 +1,592 @@
+import heapq
+import multiprocessing
+import os
+import threading
+import zlib
+
+from multiprocessing.connection import Connection
+from typing import Any, Iterable, Optional
+from uuid import UUID, uuid4
+
+from n import (
+    INDEXABLE_FIELDS,
+    VALIDATION_MESSAGES,
+    BatchValidationError,
+    Person,
+    PersonDB,
+    SortedIndex,
+    ValidationReport,
+    login_errors,
+    password_errors,
+)
+
+class _Shard(PersonDB):
+    """
+    Шард базы данных в процессе-обработчике.
+
+    Шард хранит записи о пользователях, UUID которых относятся к нему,
+    и резервирует логины, хеш которых относится к нему. Глобальная
+    уникальность логина обеспечивается тем, что логин может быть
+    зарезервирован только в одном шарде. Запросы обрабатываются
+    последовательно, поэтому шарду не нужна блокировка между запросами.
+    """
+
+    def __init__(self, hash_indexes: Iterable[str], sorted_indexes: Iterable[str]) -> None:
+        super().__init__(hash_indexes, sorted_indexes)
+        self._reservations: dict[str, UUID] = {}
+
+    def check(self, persons: list[Person]) -> dict[int, list[str]]:
+        """Проверяет формат логинов и паролей."""
+        errors = {}
+        for number, person in enumerate(persons):
+            record_errors = login_errors(person.login) + password_errors(person.password)
+            if record_errors:
+                errors[number] = record_errors
+        return errors
+
+    def taken(self, logins: list[str]) -> list[bool]:
+        """Проверяет, заняты ли логины."""
+        return [login in self._reservations for login in logins]
+
+    def lookup(self, login: str) -> Optional[UUID]:
+        return self._reservations.get(login)
+
+    def reserve(self, logins: list[tuple[str, UUID]]) -> list[int]:
+        """Резервирует свободные логины и возвращает номера занятых."""
+        conflicts = []
+        for number, (login, person_id) in enumerate(logins):
+            if login in self._reservations:
+                conflicts.append(number)
+            else:
+                self._reservations[login] = person_id
+        return conflicts
+
+    def release(self, logins: list[tuple[str, UUID]]) -> None:
+        """Освобождает логины, зарезервированные для указанных пользователей."""
+        for login, person_id in logins:
+            if self._reservations.get(login) == person_id:
+                del self._reservations[login]
+
+    def insert(self, persons: list[Person], person_ids: list[UUID]) -> None:
+        """Добавляет проверенные записи с заданными UUID."""
+        with self._lock.write():
+            self._insert_many(persons, person_ids)
+
+    def missing(self, person_ids: list[UUID]) -> list[UUID]:
+        return [person_id for person_id in person_ids if person_id not in self._database]
+
+    def logins(self, person_ids: list[UUID]) -> list[Optional[str]]:
+        """Возвращает текущие логины пользователей, None - для отсутствующих."""
+        return [
+            person.login if (person := self._database.get(person_id)) else None
+            for person_id in person_ids
+        ]
+
+    def update(self, person_id: UUID, person_info_new: Person) -> str:
+        """Обновляет запись и возвращает прежний логин."""
+        login = self.read_person_info(person_id).login
+        self.update_person_info(person_id, person_info_new)
+        return login
+
+    def delete(self, person_ids: list[UUID]) -> list[str]:
+        """Удаляет записи и возвращает логины удаленных пользователей."""
+        logins = [person.login for person in self.read_many(person_ids)]
+        self.delete_many(person_ids)
+        return logins
+
+    def find_prefix_entries(self, field: str, prefix: str) -> list[tuple[str, UUID]]:
+        """Находит пары (значение, UUID) по префиксу значения поля."""
+        for index in self._indexes.get(field, ()):
+            if isinstance(index, SortedIndex):
+                return list(index._scan(prefix, lambda found: found.startswith(prefix)))
+        raise ValueError(f"Нет упорядоченного индекса по полю {field!r}.")
+
+def _serve(
+    connection: Connection, hash_indexes: tuple[str, ...], sorted_indexes: tuple[str, ...]
+) -> None:
+    """Обрабатывает запросы к шарду, пока не получит None."""
+    shard = _Shard(hash_indexes, sorted_indexes)
+
+    while True:
+        request = connection.recv()
+        if request is None:
+            return
+        method, args = request
+        try:
+            connection.send((True, getattr(shard, method)(*args)))
+        except Exception as error:
+            # ошибка передается вызывающему, а шард продолжает работу
+            try:
+                connection.send((False, error))
+            except Exception:
+                # исключение нельзя сериализовать
+                connection.send((False, RuntimeError(repr(error))))
+
+class ShardedPersonDB:
+    """
+    База данных пользователей, распределенная по процессам.
+
+    Записи распределяются по N процессам-шардам по UUID пользователя,
+    поэтому чтения и изменения разных пользователей выполняются на разных
+    ядрах. Логин резервируется в шарде, определяемом стабильным хешем логина,
+    что обеспечивает его глобальную уникальность: создание пользователя
+    сначала резервирует логин, а затем добавляет запись. Пакетные запросы
+    разбиваются по шардам, отправляются всем шардам сразу и выполняются
+    параллельно.
+
+    Пакетные операции атомарны относительно ошибок проверки данных,
+    но не изолированы от параллельных изменений тех же записей
+    в других шардах.
+    """
+
+    def __init__(
+        self,
+        shards: Optional[int] = None,
+        hash_indexes: Iterable[str] = (),
+        sorted_indexes: Iterable[str] = (),
+    ) -> None:
+        """
+        Запускает процессы-шарды.
+
+        Args:
+            shards: число шардов. Значение по умолчанию - None,
+                число доступных процессоров.
+            hash_indexes: поля, по которым строятся хеш-индексы.
+            sorted_indexes: поля, по которым строятся упорядоченные индексы.
+
+        Raises:
+            ValueError, если поле не входит в INDEXABLE_FIELDS.
+        """
+        hash_indexes, sorted_indexes = tuple(hash_indexes), tuple(sorted_indexes)
+        for field in hash_indexes + sorted_indexes:
+            if field not in INDEXABLE_FIELDS:
+                raise ValueError(f"Поле {field!r} нельзя индексировать.")
+
+        self._connections: list[Connection] = []
+        self._processes: list[multiprocessing.Process] = []
+        self._locks: list[threading.Lock] = []
+
+        for _ in range(shards or os.cpu_count() or 1):
+            connection, child = multiprocessing.Pipe()
+            process = multiprocessing.Process(
+                target=_serve, args=(child, hash_indexes, sorted_indexes), daemon=True
+            )
+            process.start()
+            child.close()
+            self._connections.append(connection)
+            self._processes.append(process)
+            self._locks.append(threading.Lock())
+
+    def __enter__(self) -> "ShardedPersonDB":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Останавливает процессы-шарды."""
+        for lock, connection, process in zip(self._locks, self._connections, self._processes):
+            with lock:
+                if not connection.closed:
+                    try:
+                        connection.send(None)
+                    except OSError:
+                        # процесс шарда уже завершился
+                        pass
+                    connection.close()
+            process.join()
+
+    def create_person(self, person: Person) -> UUID:
+        """Создает новую запись о пользователе в базе данных."""
+        try:
+            return self.create_many([person])[0]
+        except BatchValidationError as error:
+            raise ValueError(VALIDATION_MESSAGES[error.report.errors[0][0]]) from None
+
+    def create_many(self, persons: Iterable[Person]) -> list[UUID]:
+        """
+        Создает записи о нескольких пользователях.
+
+        Raises:
+            BatchValidationError, если хотя бы одна запись невалидна.
+        """
+        persons = list(persons)
+        report = self._validate(persons, check_taken=False)
+        if not report.is_valid:
+            raise BatchValidationError(report)
+
+        person_ids = [uuid4() for _ in persons]
+        conflicts = self._reserve(persons, person_ids)
+        if conflicts:
+            self._release([person.login for person in persons], person_ids)
+            errors = {number: ["login-not-unique"] for number in conflicts}
+            raise BatchValidationError(ValidationReport(len(persons), errors))
+
+        try:
+            self._insert(persons, person_ids)
+        except Exception:
+            self._release_unused([person.login for person in persons], person_ids)
+            raise
+        return person_ids
+
+    def import_persons(
+        self, persons: Iterable[Person]
+    ) -> tuple[dict[int, UUID], ValidationReport]:
+        """
+        Создает записи о валидных пользователях, пропуская невалидные.
+
+        Returns:
+            Пару: UUID созданных записей по их номерам в persons
+            и отчет о проверке всех записей.
+        """
+        persons = list(persons)
+        report = self._validate(persons, check_taken=False)
+        numbers = [number for number in range(len(persons)) if number not in report.errors]
+        valid = [persons[number] for number in numbers]
+        person_ids = [uuid4() for _ in valid]
+
+        for position in self._reserve(valid, person_ids):
+            report.errors[numbers[position]] = ["login-not-unique"]
+        report.errors = dict(sorted(report.errors.items()))
+
+        created = {
+            number: person_id
+            for number, person_id in zip(numbers, person_ids)
+            if number not in report.errors
+        }
+        inserted = [persons[number] for number in created]
+        try:
+            self._insert(inserted, list(created.values()))
+        except Exception:
+            self._release_unused([person.login for person in inserted], list(created.values()))
+            raise
+
+        return created, report
+
+    def validate_many(self, persons: Iterable[Person]) -> ValidationReport:
+        """Проверяет записи о пользователях, не изменяя базу данных."""
+        return self._validate(list(persons), check_taken=True)
+
+    def read_person_info(self, person_id: UUID) -> Person:
+        """Читает данные пользователя из базы данных по его UUID."""
+        shard = self._shard_of(person_id)
+        return self._call({shard: ("read_person_info", (person_id,))})[shard]
+
+    def read_many(self, person_ids: Iterable[UUID]) -> list[Person]:
+        """
+        Читает данные нескольких пользователей.
+
+        Raises:
+            KeyError, если хотя бы один пользователь не найден.
+        """
+        person_ids = list(person_ids)
+        groups = self._group([self._shard_of(person_id) for person_id in person_ids])
+        results = self._call({
+            shard: ("read_many", ([person_ids[number] for number in numbers],))
+            for shard, numbers in groups.items()
+        })
+
+        persons: list[Any] = [None] * len(person_ids)
+        for shard, numbers in groups.items():
+            for number, person in zip(numbers, results[shard]):
+                persons[number] = person
+        return persons
+
+    def find_persons(self, field: str, value: str) -> list[UUID]:
+        """
+        Находит пользователей по точному значению поля с помощью индексов шардов.
+
+        Raises:
+            ValueError, если по полю нет индекса.
+        """
+        if field == "login":
+            shard = self._login_shard(value)
+            person_id = self._call({shard: ("lookup", (value,))})[shard]
+            return [] if person_id is None else [person_id]
+
+        results = self._call({
+            shard: ("find_persons", (field, value)) for shard in range(len(self._connections))
+        })
+        return [person_id for shard in sorted(results) for person_id in results[shard]]
+
+    def find_persons_by_prefix(self, field: str, prefix: str) -> list[UUID]:
+        """
+        Находит пользователей по префиксу значения поля, упорядоченных по значению.
+
+        Raises:
+            ValueError, если по полю нет упорядоченного индекса.
+        """
+        results = self._call({
+            shard: ("find_prefix_entries", (field, prefix))
+            for shard in range(len(self._connections))
+        })
+        return [person_id for _, person_id in heapq.merge(*results.values())]
+
+    def update_person_info(self, person_id: UUID, person_info_new: Person) -> None:
+        """
+        Обновляет данные о пользователе по его UUID.
+
+        Новый логин резервируется до изменения записи, а прежний
+        освобождается после него.
+        """
+        shard = self._shard_of(person_id)
+        login = person_info_new.login
+
+        if login:
+            if login_errors(login):
+                raise ValueError(VALIDATION_MESSAGES["login-format"])
+            if self._reserve([person_info_new], [person_id]):
+                current = self.read_person_info(person_id)
+                if current.login != login:
+                    raise ValueError(VALIDATION_MESSAGES["login-not-unique"])
+                login = ""
+
+        try:
+            old_login = self._call({shard: ("update", (person_id, person_info_new))})[shard]
+        except Exception:
+            if login:
+                self._release_unused([login], [person_id])
+            raise
+
+        if login and old_login != login:
+            self._release([old_login], [person_id])
+
+    def delete_person(self, person_id: UUID) -> None:
+        """Удаляет запись о пользователе по его UUID."""
+        self.delete_many([person_id])
+
+    def delete_many(self, person_ids: Iterable[UUID]) -> None:
+        """
+        Удаляет записи о нескольких пользователях.
+
+        Raises:
+            KeyError, если хотя бы один пользователь не найден.
+        """
+        person_ids = list(dict.fromkeys(person_ids))
+        groups = self._group([self._shard_of(person_id) for person_id in person_ids])
+        batches = {
+            shard: [person_ids[number] for number in numbers] for shard, numbers in groups.items()
+        }
+
+        missing = self._call({shard: ("missing", (batch,)) for shard, batch in batches.items()})
+        if any(missing.values()):
+            raise KeyError("Пользователь не найден.")
+
+        logins = self._call({shard: ("delete", (batch,)) for shard, batch in batches.items()})
+        self._release(
+            [login for shard in batches for login in logins[shard]],
+            [person_id for shard in batches for person_id in batches[shard]],
+        )
+
+    def _shard_of(self, person_id: UUID) -> int:
+        return person_id.int % len(self._connections)
+
+    def _login_shard(self, login: str) -> int:
+        # стабильный хеш: hash строки зависит от процесса
+        return zlib.crc32(login.encode()) % len(self._connections)
+
+    @staticmethod
+    def _group(shards: list[int]) -> dict[int, list[int]]:
+        """Группирует номера элементов по шардам."""
+        groups: dict[int, list[int]] = {}
+        for number, shard in enumerate(shards):
+            groups.setdefault(shard, []).append(number)
+        return groups
+
+    def _call(self, requests: dict[int, tuple[str, tuple]]) -> dict[int, Any]:
+        """
+        Отправляет запросы шардам и возвращает их ответы.
+
+        Сначала запросы отправляются всем шардам, затем собираются ответы,
+        поэтому шарды обрабатывают запросы параллельно. Каналы шардов
+        захватываются в порядке номеров, что исключает взаимную блокировку
+        потоков, обращающихся к разным наборам шардов.
+        """
+        shards = sorted(requests)
+        for shard in shards:
+            self._locks[shard].acquire()
+        try:
+            for shard in shards:
+                self._connections[shard].send(requests[shard])
+            responses = {shard: self._connections[shard].recv() for shard in shards}
+        finally:
+            for shard in shards:
+                self._locks[shard].release()
+
+        for success, result in responses.values():
+            if not success:
+                raise result
+        return {shard: result for shard, (_, result) in responses.items()}
+
+    def _validate(self, persons: list[Person], check_taken: bool) -> ValidationReport:
+        """Проверяет формат записей в шардах и уникальность логинов."""
+        groups = self._group([number % len(self._connections) for number in range(len(persons))])
+        results = self._call({
+            shard: ("check", ([persons[number] for number in numbers],))
+            for shard, numbers in groups.items()
+        })
+
+        errors = {
+            groups[shard][position]: record_errors
+            for shard, shard_errors in results.items()
+            for position, record_errors in shard_errors.items()
+        }
+
+        # логины, не являющиеся строками, невалидны и не проверяются на уникальность
+        numbers = [
+            number for number, person in enumerate(persons) if isinstance(person.login, str)
+        ]
+        logins = [persons[number].login for number in numbers]
+        taken = self._taken(logins) if check_taken else [False] * len(logins)
+        seen = set()
+        for number, login, is_taken in zip(numbers, logins, taken):
+            if is_taken or login in seen:
+                record_errors = errors.setdefault(number, [])
+                position = 1 if record_errors[:1] == ["login-format"] else 0
+                record_errors.insert(position, "login-not-unique")
+            seen.add(login)
+
+        return ValidationReport(len(persons), dict(sorted(errors.items())))
+
+    def _taken(self, logins: list[str]) -> list[bool]:
+        groups = self._group([self._login_shard(login) for login in logins])
+        results = self._call({
+            shard: ("taken", ([logins[number] for number in numbers],))
+            for shard, numbers in groups.items()
+        })
+
+        taken = [False] * len(logins)
+        for shard, numbers in groups.items():
+            for number, is_taken in zip(numbers, results[shard]):
+                taken[number] = is_taken
+        return taken
+
+    def _reserve(self, persons: list[Person], person_ids: list[UUID]) -> list[int]:
+        """Резервирует логины и возвращает номера записей с занятыми логинами."""
+        groups = self._group([self._login_shard(person.login) for person in persons])
+        results = self._call({
+            shard: (
+                "reserve", ([(persons[number].login, person_ids[number]) for number in numbers],)
+            )
+            for shard, numbers in groups.items()
+        })
+        return sorted(
+            groups[shard][position]
+            for shard, conflicts in results.items()
+            for position in conflicts
+        )
+
+    def _release(self, logins: list[str], person_ids: list[UUID]) -> None:
+        groups = self._group([self._login_shard(login) for login in logins])
+        self._call({
+            shard: ("release", ([(logins[number], person_ids[number]) for number in numbers],))
+            for shard, numbers in groups.items()
+        })
+
+    def _release_unused(self, logins: list[str], person_ids: list[UUID]) -> None:
+        """
+        Освобождает зарезервированные логины после неудачного изменения.
+
+        Логин остается зарезервированным, если запись пользователя все же
+        получила его, например, когда шард успел добавить запись.
+        """
+        groups = self._group([self._shard_of(person_id) for person_id in person_ids])
+        results = self._call({
+            shard: ("logins", ([person_ids[number] for number in numbers],))
+            for shard, numbers in groups.items()
+        })
+        unused = [
+            number
+            for shard, numbers in groups.items()
+            for number, current in zip(numbers, results[shard])
+            if current != logins[number]
+        ]
+        self._release(
+            [logins[number] for number in unused], [person_ids[number] for number in unused]
+        )
+
+    def _insert(self, persons: list[Person], person_ids: list[UUID]) -> None:
+        groups = self._group([self._shard_of(person_id) for person_id in person_ids])
+        self._call({
+            shard: (
+                "insert",
+                (
+                    [persons[number] for number in numbers],
+                    [person_ids[number] for number in numbers],
+                ),
+            )
+            for shard, numbers in groups.items()
+        })
+
+# Пример тестирования
+if __name__ == "__main__":
+    database = ShardedPersonDB(shards=4, hash_indexes=["username"], sorted_indexes=["username"])
+
+    with database:
+        persons = [
+            Person(password="Aa1Bb2Cc3Dd4", login=f"login{i}", username=f"user#{i:02d}")
+            for i in range(20)
+        ]
+        person_ids = database.create_many(persons)
+
+        assert database.read_many(person_ids) == persons
+        assert database.find_persons("login", "login7") == [person_ids[7]]
+        assert database.find_persons("username", "user#03") == [person_ids[3]]
+        assert database.find_persons_by_prefix("username", "user#1") == person_ids[10:20]
+
+        # логин уникален во всех шардах
+        try:
+            database.create_person(Person(password="Aa1Bb2Cc3Dd4", login="login7", username="x"))
+            assert False
+        except ValueError:
+            assert True
+
+        # логин, не являющийся строкой, невалиден
+        try:
+            database.create_person(Person(password="Aa1Bb2Cc3Dd4", login=None, username="x"))
+            assert False
+        except ValueError:
+            assert database.read_many(person_ids) == persons
+
+        report = database.validate_many(
+            [persons[0], Person(password="abc", login="new", username="x")]
+        )
+        assert report.errors == {
+            0: ["login-not-unique"],
+            1: ["password-too-short", "password-no-upper", "password-no-digits"],
+        }
+
+        database.update_person_info(person_ids[0], Person(password="", login="admin", username=""))
+        assert database.find_persons("login", "login0") == []
+        assert database.find_persons("login", "admin") == [person_ids[0]]
+        database.create_person(Person(password="Aa1Bb2Cc3Dd4", login="login0", username="x"))
+
+        try:
+            database.update_person_info(
+                person_ids[1], Person(password="", login="admin", username="")
+            )
+            assert False
+        except ValueError:
+            assert database.read_person_info(person_ids[1]).login == "login1"
+
+        # если записи не удалось добавить, их логины снова свободны
+        insert = database._insert
+
+        def fail_insert(persons: list[Person], person_ids: list[UUID]) -> None:
+            raise RuntimeError("Шард недоступен.")
+
+        database._insert = fail_insert
+        try:
+            database.create_person(Person(password="Aa1Bb2Cc3Dd4", login="spare", username="x"))
+            assert False
+        except RuntimeError:
+            database._insert = insert
+        database.create_person(Person(password="Aa1Bb2Cc3Dd4", login="spare", username="x"))
+
+        database.delete_many(person_ids[:5])
+        assert database.find_persons("login", "admin") == []
+        try:
+            database.delete_person(person_ids[0])
+            assert False
+        except KeyError:
+            assert True
@@ -1,7 +1,9 @@
+import os
+import sys
+
 from abc import ABC, abstractmethod
+
 import numpy as np
-import matplotlib.pyplot as plt
-from sklearn.linear_model import LinearRegression
 
 class RegressorABC(ABC):
     @abstractmethod
@@ -12,51 +14,31 @@ class RegressorABC(ABC):
     def predict(self, X):
         pass
 
-class KernelRegressor(RegressorABC):
+class LeastSquaresRegressor(RegressorABC):
     def __init__(self):
-        self.X_train = None
-        self.y_train = None
+        # sklearn импортируется при первом обучении, а не при импорте модуля
+        self.model = None
 
     def fit(self, X, y):
-        self.X_train = np.asarray(X)
-        self.y_train = np.asarray(y)
-
-    def epanechnikov_kernel(self, u):
-        return (3/4) * (1 - u**2) * (np.abs(u) <= 1)
-
-    def predict(self, X):
-        X = np.asarray(X)
-        n_samples = X.shape[0]
-        predictions = np.zeros(n_samples)
-
-        for i, x in enumerate(X):
-            # Compute distances from x to all points in the training set
-            distances = np.abs(self.X_train - x)
-            # Determine k for adaptive bandwidth
-            k = np.argsort(distances)[1]  # choose the second closest point
-            adaptive_bandwidth = distances[k]
-
-            # Evaluate kernel weights
-            weights = self.epanechnikov_kernel(distances / adaptive_bandwidth)
-            weights /= np.sum(weights)  # Normalize weights
-
-            # Compute the prediction
-            predictions[i] = np.sum(weights * self.y_train)
+        from sklearn.linear_model import LinearRegression
 
-        return predictions
-
-class LeastSquaresRegressor(RegressorABC):
-    def __init__(self):
         self.model = LinearRegression()
-
-    def fit(self, X, y):
         self.model.fit(X.reshape(-1, 1), y)
 
     def predict(self, X):
+        if self.model is None:
+            raise RuntimeError("regressor must be fitted before prediction")
+
         return self.model.predict(X.reshape(-1, 1))
 
 # Пример использования
 def main():
+    import matplotlib.pyplot as plt
+
+    # KernelRegressor находится в пакете practice/regressors
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "practice"))
+    from regressors.kernel_regressor import KernelRegressor
+
     # Сгенерируем данные
     np.random.seed(42)
     X_train = np.sort(np.random.rand(100))
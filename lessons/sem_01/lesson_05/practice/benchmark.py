@@ -0,0 +1,242 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+from datetime import datetime, timezone
+from typing import Any, Callable, NamedTuple
+
+import numpy as np
+
+from regressors.kernel_regressor import KernelRegressor
+from regressors.lsm_regressor import RegressorLSM
+from regressors.nonparametric_regressor import NonparametricRegressor
+from regressors.regressor_abc import RegressorABC
+from utils import BOUNDS, K_NEIGHBOURS, linear, linear_modulated
+
+
+SIZES = [10**power for power in range(3, 8)]
+FUNCTIONS = [linear, linear_modulated]
+REGRESSORS: dict[str, Callable[[], RegressorABC]] = {
+    "RegressorLSM": RegressorLSM,
+    "NonparametricRegressor": lambda: NonparametricRegressor(K_NEIGHBOURS),
+    "KernelRegressor": KernelRegressor,
+}
+
+
+parser = argparse.ArgumentParser(
+    description=(
+        "Measures fit and predict time, throughput, peak memory"
+        " and held-out error of regressors and writes them as json"
+    )
+)
+parser.add_argument(
+    "--sizes",
+    type=int,
+    nargs="+",
+    default=SIZES,
+    help="amounts of points in generated datasets",
+)
+parser.add_argument(
+    "--regressors",
+    nargs="+",
+    choices=list(REGRESSORS),
+    default=list(REGRESSORS),
+    help="names of regressors to benchmark",
+)
+parser.add_argument(
+    "--repeats",
+    type=int,
+    default=1,
+    help="amount of timed runs, the best time is reported",
+)
+parser.add_argument(
+    "--seed",
+    type=int,
+    default=42,
+    help="seed of random noise in generated datasets",
+)
+parser.add_argument(
+    "--output",
+    default="benchmark.json",
+    help="path to json file with results",
+)
+
+
+def measure_time(action: Callable[[], Any], repeats: int) -> float:
+    """
+    Измеряет время выполнения действия.
+
+    Args:
+        action: измеряемое действие.
+        repeats: число запусков.
+
+    Returns:
+        Наименьшее время выполнения в секундах.
+    """
+    timings = []
+
+    for _ in range(repeats):
+        start = time.perf_counter()
+        action()
+        timings.append(time.perf_counter() - start)
+
+    return min(timings)
+
+
+def measure_peak_memory(action: Callable[[], Any]) -> int:
+    """
+    Измеряет пиковый объем памяти, выделенной во время выполнения действия.
+
+    Память измеряется с помощью tracemalloc, который учитывает и буферы
+    массивов NumPy. Трассировка замедляет выполнение, поэтому память
+    измеряется отдельным запуском.
+
+    Args:
+        action: измеряемое действие.
+
+    Returns:
+        Пиковый объем выделенной памяти в байтах.
+    """
+    tracemalloc.start()
+
+    try:
+        action()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return peak
+
+
+class Dataset(NamedTuple):
+    """
+    Набор данных для измерений.
+
+    Attrs:
+        function: имя зависимости, по которой сгенерированы данные.
+        train_abscissa: абсциссы обучающих точек.
+        train_ordinates: ординаты обучающих точек.
+        test_abscissa: абсциссы отложенных точек, лежащих между соседними
+            обучающими точками.
+        test_ordinates: ординаты отложенных точек.
+    """
+    function: str
+    train_abscissa: np.ndarray
+    train_ordinates: np.ndarray
+    test_abscissa: np.ndarray
+    test_ordinates: np.ndarray
+
+
+def generate_dataset(function: Callable[[np.ndarray], np.ndarray], size: int) -> Dataset:
+    """
+    Генерирует обучающие и отложенные точки.
+
+    Отложенные точки не совпадают с обучающими, поэтому ошибка на них
+    не обнуляется регрессорами, которые интерполируют обучающую выборку.
+    Точки сдвинуты на четверть шага, а не на половину: середина отрезка
+    равноудалена от двух обучающих точек, и у KernelRegressor, ширина окна
+    которого - расстояние до второй ближайшей точки, обе точки получают
+    нулевой вес.
+
+    Args:
+        function: зависимость, по которой генерируются данные.
+        size: число обучающих точек.
+
+    Returns:
+        Набор данных.
+    """
+    abscissa = np.linspace(*BOUNDS, size)
+    held_out = abscissa[:-1] + np.diff(abscissa) / 4
+
+    return Dataset(
+        function.__name__, abscissa, function(abscissa), held_out, function(held_out)
+    )
+
+
+def benchmark(name: str, dataset: Dataset, repeats: int) -> dict[str, Any]:
+    """
+    Измеряет характеристики регрессора на одном наборе данных.
+
+    Args:
+        name: имя регрессора из REGRESSORS.
+        dataset: набор данных, общий для всех регрессоров.
+        repeats: число запусков для измерения времени.
+
+    Returns:
+        Словарь с результатами измерений.
+    """
+    train_abscissa, train_ordinates = dataset.train_abscissa, dataset.train_ordinates
+    test_abscissa = dataset.test_abscissa
+    regressor = REGRESSORS[name]()
+
+    fit_seconds = measure_time(lambda: regressor.fit(train_abscissa, train_ordinates), repeats)
+    fit_peak_bytes = measure_peak_memory(lambda: regressor.fit(train_abscissa, train_ordinates))
+    predict_seconds = measure_time(lambda: regressor.predict(test_abscissa), repeats)
+    predict_peak_bytes = measure_peak_memory(lambda: regressor.predict(test_abscissa))
+    predictions = regressor.predict(test_abscissa)
+
+    return {
+        "regressor": name,
+        "function": dataset.function,
+        "size": train_abscissa.size,
+        "fit_seconds": fit_seconds,
+        "fit_points_per_second": train_abscissa.size / fit_seconds if fit_seconds else None,
+        "fit_peak_bytes": fit_peak_bytes,
+        "predict_seconds": predict_seconds,
+        "predict_points_per_second": (
+            test_abscissa.size / predict_seconds if predict_seconds else None
+        ),
+        "predict_peak_bytes": predict_peak_bytes,
+        "holdout_rmse": float(np.sqrt(np.mean((predictions - dataset.test_ordinates) ** 2))),
+    }
+
+
+def describe_environment() -> dict[str, Any]:
+    """Собирает сведения об окружении, необходимые для сравнения результатов."""
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": sys.version,
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def main() -> None:
+    """Запускает измерения и сохраняет результаты."""
+    args = parser.parse_args()
+    results = []
+
+    for size in args.sizes:
+        for function in FUNCTIONS:
+            np.random.seed(args.seed)
+            dataset = generate_dataset(function, size)
+
+            for name in args.regressors:
+                result = benchmark(name, dataset, args.repeats)
+                results.append(result)
+                print(
+                    f"{name:>24} {function.__name__:>16} {size:>10}: "
+                    f"fit {result['fit_seconds']:.4f}s, "
+                    f"predict {result['predict_seconds']:.4f}s, "
+                    f"holdout rmse {result['holdout_rmse']:.4f}"
+                )
+
+    report = {
+        "environment": describe_environment(),
+        "seed": args.seed,
+        "repeats": args.repeats,
+        "results": results,
+    }
+
+    with open(args.output, "w") as file:
+        json.dump(report, file, indent=4)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
 import matplotlib.pyplot as plt
 
-from utils import main
+from plotting import main
 
 
 if __name__ == "__main__":
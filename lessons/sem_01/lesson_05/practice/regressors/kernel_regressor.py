@@ -0,0 +1,292 @@
+import os
+
+from typing import Optional, Sequence, Union
+from numbers import Real
+
+import numpy as np
+
+from regressors.regressor_abc import RegressorABC
+
+
+class KernelRegressor(RegressorABC):
+    """
+    Ядерная регрессия с ядром Епанечникова.
+
+    Ширина окна для точки - расстояние до второй ближайшей точки обучающей
+    выборки. Обучающая выборка хранится отсортированной, поэтому ширина окна
+    и диапазон точек с ненулевым весом находятся бинарным поиском, а точки
+    за пределами окна не рассматриваются. Ядро вычисляется за один проход
+    NumPy для блока точек запроса: размер блока подбирается так, чтобы
+    промежуточные массивы не превышали memory_budget байт.
+
+    Вместо адаптивной ширины окна можно использовать общую для всех точек
+    ширину: заданную явно или подобранную при обучении скользящим контролем
+    с исключением по одному объекту (см. select_bandwidth).
+    """
+
+    # Число промежуточных 8-байтовых массивов размера блока
+    _TEMPORARIES = 6
+    # Число ширин окна, перебираемых по умолчанию при скользящем контроле
+    _CANDIDATES_AMOUNT = 32
+
+    X_train: Optional[np.ndarray]
+    y_train: Optional[np.ndarray]
+    fitted_bandwidth: Optional[float]
+
+    def __init__(
+        self,
+        memory_budget: int = 256 * 2**20,
+        bandwidth: Union[None, Real, str] = None,
+    ) -> None:
+        """
+        Инициализирует регрессор.
+
+        Args:
+            memory_budget: ограничение на размер промежуточных массивов
+                при предсказании в байтах. Значение по умолчанию - 256 МиБ.
+            bandwidth: ширина окна. None - адаптивная ширина, равная расстоянию
+                до второй ближайшей точки; число - общая ширина окна; "loo" -
+                общая ширина окна, подобранная при обучении скользящим контролем.
+                Значение по умолчанию - None.
+
+        Raises:
+            ValueError, если bandwidth - не положительное число или
+                строка, отличная от "loo".
+        """
+        if isinstance(bandwidth, str) and bandwidth != "loo":
+            raise ValueError(f"unknown bandwidth selection method {bandwidth!r}")
+
+        if isinstance(bandwidth, Real) and not bandwidth > 0:
+            raise ValueError(f"bandwidth must be positive, got {bandwidth}")
+
+        self.X_train = None
+        self.y_train = None
+        self.fitted_bandwidth = None
+        self.memory_budget = memory_budget
+        self.bandwidth = bandwidth
+
+    def fit(self, abscissa: Sequence[Real], ordinates: Sequence[Real]) -> None:
+        abscissa = np.asarray(abscissa, dtype=np.float64).ravel()
+        order = np.argsort(abscissa, kind="stable")
+        self.X_train = abscissa[order]
+        self.y_train = np.asarray(ordinates, dtype=np.float64).ravel()[order]
+
+        if self.bandwidth == "loo":
+            self.fitted_bandwidth = self.select_bandwidth()
+        elif self.bandwidth is not None:
+            self.fitted_bandwidth = float(self.bandwidth)
+        else:
+            self.fitted_bandwidth = None
+
+    def select_bandwidth(
+        self,
+        candidates: Optional[Sequence[Real]] = None,
+        workers: Optional[int] = None,
+    ) -> float:
+        """
+        Подбирает общую ширину окна скользящим контролем.
+
+        Args:
+            candidates: перебираемые ширины окна. Значение по умолчанию - None,
+                сетка в геометрической прогрессии от наибольшего расстояния
+                между соседними точками до размаха выборки.
+            workers: число потоков для параллельной оценки ширин. Значение
+                по умолчанию - None, число доступных процессоров.
+
+        Returns:
+            Ширина окна с наименьшей ошибкой скользящего контроля.
+
+        Raises:
+            RuntimeError, если регрессор не обучен.
+            ValueError, если ни для одной ширины ошибка не определена.
+        """
+        if self.X_train is None:
+            raise RuntimeError("regressor must be fitted before bandwidth selection")
+
+        if candidates is None:
+            candidates = self._default_candidates()
+
+        candidates = np.asarray(candidates, dtype=np.float64).ravel()
+        errors = self.loo_errors(candidates, workers)
+
+        if not np.isfinite(errors).any():
+            raise ValueError("leave-one-out error is undefined for all candidates")
+
+        return float(candidates[np.argmin(errors)])
+
+    def loo_errors(
+        self,
+        candidates: Sequence[Real],
+        workers: Optional[int] = None,
+    ) -> np.ndarray:
+        """
+        Вычисляет ошибку скользящего контроля с исключением по одному объекту.
+
+        Для ширины окна h ядро Епанечникова - квадратичная функция расстояния
+        внутри окна, поэтому суммы весов и взвешенных ординат по окну точки
+        выражаются через разности префиксных сумм 1, x, x^2, y, xy и x^2 y
+        отсортированной выборки. Окно каждой точки находится бинарным поиском,
+        и оценка одной ширины требует O(n log n) операций вместо O(n^2).
+        Ширины оцениваются параллельно в пуле потоков: префиксные суммы общие,
+        а NumPy освобождает GIL во время вычислений.
+
+        Точность ограничена вычитанием префиксных сумм: относительная ошибка
+        растет как квадрат отношения размаха выборки к ширине окна.
+
+        Args:
+            candidates: перебираемые ширины окна.
+            workers: число потоков. Значение по умолчанию - None,
+                число доступных процессоров.
+
+        Returns:
+            Массив средних квадратов ошибок для каждой ширины. Если для
+            какой-либо точки окно не содержит других точек, ошибка равна inf.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        # центрирование и нормировка уменьшают потерю точности при вычитании
+        center = (self.X_train[0] + self.X_train[-1]) / 2
+        scale = max((self.X_train[-1] - self.X_train[0]) / 2, np.finfo(np.float64).tiny)
+        abscissa = (self.X_train - center) / scale
+        ordinates = self.y_train
+
+        moments = np.stack([
+            np.ones_like(abscissa),
+            abscissa,
+            abscissa**2,
+            ordinates,
+            abscissa * ordinates,
+            abscissa**2 * ordinates,
+        ])
+        prefix = np.zeros((moments.shape[0], abscissa.size + 1))
+        np.cumsum(moments, axis=1, out=prefix[:, 1:])
+
+        def evaluate(bandwidth: float) -> float:
+            return _loo_error(abscissa, ordinates, prefix, bandwidth / scale)
+
+        with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+            return np.fromiter(pool.map(evaluate, np.asarray(candidates, dtype=np.float64)), float)
+
+    def _default_candidates(self) -> np.ndarray:
+        gaps = np.diff(self.X_train)
+        span = self.X_train[-1] - self.X_train[0]
+        lowest = gaps.max(initial=0.0)
+
+        if not lowest > 0:
+            raise ValueError("at least two distinct points are required")
+
+        return np.geomspace(lowest, max(span, lowest), self._CANDIDATES_AMOUNT)
+
+    @staticmethod
+    def epanechnikov_kernel(u: np.ndarray) -> np.ndarray:
+        """Вычисляет ядро Епанечникова."""
+        return (3/4) * (1 - u**2) * (np.abs(u) <= 1)
+
+    def predict(self, abscissa: Union[Real, Sequence[Real]]) -> np.ndarray:
+        if self.X_train is None:
+            raise RuntimeError("regressor must be fitted before prediction")
+
+        queries = np.asarray(abscissa, dtype=np.float64).ravel()
+
+        if self.fitted_bandwidth is None:
+            bandwidths = self._second_closest_distances(queries)
+        else:
+            bandwidths = np.full(queries.size, self.fitted_bandwidth)
+
+        lower = np.searchsorted(self.X_train, queries - bandwidths, side="left")
+        upper = np.searchsorted(self.X_train, queries + bandwidths, side="right")
+        widths = upper - lower
+        ends = np.cumsum(widths)
+
+        max_elements = max(1, self.memory_budget // (8 * self._TEMPORARIES))
+        predictions = np.empty(queries.size)
+        start = 0
+
+        while start < queries.size:
+            # блок - наибольшее число точек, суммарный размер окон которых
+            # укладывается в бюджет памяти, но не меньше одной точки
+            limit = (ends[start - 1] if start else 0) + max_elements
+            stop = max(start + 1, int(np.searchsorted(ends, limit, side="right")))
+
+            predictions[start:stop] = self._predict_block(
+                queries[start:stop], bandwidths[start:stop], lower[start:stop], widths[start:stop]
+            )
+            start = stop
+
+        return predictions
+
+    def _shared_arrays(self) -> dict[str, np.ndarray]:
+        return {"X_train": self.X_train, "y_train": self.y_train}
+
+    def _second_closest_distances(self, queries: np.ndarray) -> np.ndarray:
+        # две ближайшие точки лежат среди двух соседей слева и двух справа
+        # от позиции вставки запроса в отсортированную выборку
+        positions = np.searchsorted(self.X_train, queries)
+        candidates = positions[:, np.newaxis] + np.arange(-2, 2)
+        valid = (candidates >= 0) & (candidates < self.X_train.size)
+        distances = np.abs(
+            self.X_train[np.clip(candidates, 0, self.X_train.size - 1)] - queries[:, np.newaxis]
+        )
+        distances[~valid] = np.inf
+
+        return np.partition(distances, 1, axis=1)[:, 1]
+
+    def _predict_block(
+        self,
+        queries: np.ndarray,
+        bandwidths: np.ndarray,
+        lower: np.ndarray,
+        widths: np.ndarray,
+    ) -> np.ndarray:
+        # пары (точка запроса, точка выборки из ее окна) в плоских массивах
+        rows = np.repeat(np.arange(queries.size), widths)
+        offsets = np.cumsum(widths) - widths
+        columns = lower[rows] + np.arange(rows.size) - offsets[rows]
+
+        distances = np.abs(self.X_train[columns] - queries[rows])
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scaled = distances / bandwidths[rows]
+
+        # при нулевой ширине окна учитываются только совпадающие точки (0 / 0)
+        scaled[np.isnan(scaled)] = 0.0
+        weights = self.epanechnikov_kernel(scaled)
+
+        numerator = np.bincount(rows, weights * self.y_train[columns], minlength=queries.size)
+        denominator = np.bincount(rows, weights, minlength=queries.size)
+
+        return numerator / denominator
+
+
+def _loo_error(
+    abscissa: np.ndarray,
+    ordinates: np.ndarray,
+    prefix: np.ndarray,
+    bandwidth: float,
+) -> float:
+    """
+    Вычисляет ошибку скользящего контроля для одной ширины окна.
+
+    Args:
+        abscissa: отсортированные абсциссы точек.
+        ordinates: ординаты точек.
+        prefix: префиксные суммы 1, x, x^2, y, xy, x^2 y формы (6, n + 1).
+        bandwidth: ширина окна в тех же единицах, что и abscissa.
+
+    Returns:
+        Средний квадрат ошибки или inf, если ошибка не определена.
+    """
+    lower = np.searchsorted(abscissa, abscissa - bandwidth, side="left")
+    upper = np.searchsorted(abscissa, abscissa + bandwidth, side="right")
+    count, sum_x, sum_xx, sum_y, sum_xy, sum_xxy = prefix[:, upper] - prefix[:, lower]
+
+    # сумма (1 - (x_i - x_j)^2 / h^2) по окну без слагаемого j = i, равного 1;
+    # множитель 3/4 ядра сокращается
+    squared = bandwidth * bandwidth
+    weights = count - (abscissa**2 * count - 2 * abscissa * sum_x + sum_xx) / squared - 1
+    weighted = sum_y - (abscissa**2 * sum_y - 2 * abscissa * sum_xy + sum_xxy) / squared - ordinates
+
+    if not (weights > 1e-12).all():
+        return np.inf
+
+    return float(np.mean((weighted / weights - ordinates) ** 2))
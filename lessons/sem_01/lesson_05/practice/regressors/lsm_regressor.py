@@ -1,14 +1,101 @@
 from typing import Sequence, Union
 from numbers import Real
 
+import numpy as np
+
 from regressors.regressor_abc import RegressorABC
 
 
 class RegressorLSM(RegressorABC):
+    """
+    Линейная регрессия методом наименьших квадратов.
+
+    Регрессор хранит только достаточные статистики выборки: число точек,
+    средние абсцисс и ординат, сумму квадратов отклонений абсцисс и
+    сумму произведений отклонений абсцисс и ординат. Статистики можно
+    накапливать по частям с помощью partial_fit, поэтому выборка не обязана
+    помещаться в память целиком.
+    """
+
+    def __init__(self) -> None:
+        """Инициализирует необученный регрессор."""
+        self._reset()
+
     def fit(self, abscissa: Sequence[Real], ordinates: Sequence[Real]) -> None:
-        # ваш код
-        pass
+        self._reset()
+        self.partial_fit(abscissa, ordinates)
+
+    def partial_fit(self, abscissa: Sequence[Real], ordinates: Sequence[Real]) -> None:
+        """
+        Дообучает регрессор на очередной порции данных.
+
+        Статистики порции объединяются с накопленными по формулам Чана,
+        что дает тот же результат, что и обучение на всей выборке сразу,
+        без потери точности из-за вычитания больших сумм.
+
+        Args:
+            abscissa: последовательность абсцисс точек.
+            ordinates: последовательность ординат точек.
+
+        Raises:
+            ValueError, если длины abscissa и ordinates не совпадают.
+        """
+        abscissa = np.asarray(abscissa, dtype=np.float64).ravel()
+        ordinates = np.asarray(ordinates, dtype=np.float64).ravel()
+
+        if abscissa.size != ordinates.size:
+            raise ValueError(
+                f"abscissa and ordinates must have equal sizes, "
+                f"got {abscissa.size} and {ordinates.size}"
+            )
+
+        if not abscissa.size:
+            return
+
+        chunk_size = abscissa.size
+        chunk_mean_x = abscissa.mean()
+        chunk_mean_y = ordinates.mean()
+        deviations_x = abscissa - chunk_mean_x
+        chunk_ssx = deviations_x @ deviations_x
+        chunk_sxy = deviations_x @ (ordinates - chunk_mean_y)
+
+        size = self._size + chunk_size
+        delta_x = chunk_mean_x - self._mean_x
+        delta_y = chunk_mean_y - self._mean_y
+        weight = self._size * chunk_size / size
+
+        self._ssx += chunk_ssx + delta_x * delta_x * weight
+        self._sxy += chunk_sxy + delta_x * delta_y * weight
+        self._mean_x += delta_x * chunk_size / size
+        self._mean_y += delta_y * chunk_size / size
+        self._size = size
+
+    def predict(self, abscissa: Union[Real, Sequence[Real]]) -> np.ndarray:
+        slope, intercept = self.coefficients
+
+        return slope * np.atleast_1d(np.asarray(abscissa, dtype=np.float64)) + intercept
+
+    @property
+    def coefficients(self) -> tuple[float, float]:
+        """
+        Коэффициенты прямой y = slope * x + intercept.
+
+        Если все абсциссы совпадают, прямая горизонтальна и проходит
+        через среднее значение ординат.
+
+        Raises:
+            RuntimeError, если регрессор не обучен.
+        """
+        if not self._size:
+            raise RuntimeError("regressor must be fitted before prediction")
+
+        slope = self._sxy / self._ssx if self._ssx else 0.0
+
+        return slope, self._mean_y - slope * self._mean_x
 
-    def predict(self, abscissa: Union[Real, Sequence[Real]]) -> list:
-        # ваш код
-        return [abscissa] if isinstance(abscissa, Real) else abscissa
+    def _reset(self) -> None:
+        self._size = 0
+        self._mean_x = 0.0
+        self._mean_y = 0.0
+        self._ssx = 0.0
+        self._sxy = 0.0
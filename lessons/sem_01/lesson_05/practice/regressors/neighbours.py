@@ -0,0 +1,199 @@
+import heapq
+
+from typing import Union
+
+import numpy as np
+
+
+class SortedIndex:
+    """
+    Индекс для поиска ближайших соседей на прямой.
+
+    Точки сортируются один раз при построении индекса. k ближайших
+    соседей точки на прямой всегда образуют непрерывный отрезок
+    отсортированного массива, поэтому начало этого отрезка находится
+    бинарным поиском, и запрос выполняется за O(log n + k). Бинарный поиск
+    выполняется сразу для всех точек запроса средствами NumPy.
+    """
+
+    def __init__(self, points: np.ndarray) -> None:
+        """
+        Строит индекс.
+
+        Args:
+            points: одномерный массив точек.
+        """
+        points = np.asarray(points, dtype=np.float64).ravel()
+
+        self._order = np.argsort(points, kind="stable")
+        self._points = points[self._order]
+
+    def __len__(self) -> int:
+        return self._points.size
+
+    def query(self, queries: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Находит k ближайших соседей для каждой точки запроса.
+
+        Args:
+            queries: одномерный массив точек запроса.
+            k: число соседей, не превосходящее размер индекса.
+
+        Returns:
+            Пару массивов формы (len(queries), k): расстояния до соседей
+            и их индексы в исходном массиве точек. Порядок соседей внутри
+            строки не определен.
+        """
+        queries = np.asarray(queries, dtype=np.float64).ravel()
+        points = self._points
+        lower = np.zeros(queries.size, dtype=np.intp)
+        upper = np.full(queries.size, points.size - k, dtype=np.intp)
+
+        # ищем начало окна из k точек: окно сдвигается вправо, пока левая
+        # точка дальше от запроса, чем первая точка за правой границей окна
+        active = lower < upper
+
+        while active.any():
+            middle = (lower + upper) // 2
+            following = points[np.minimum(middle + k, points.size - 1)]
+            shift = queries - points[middle] > following - queries
+            lower = np.where(active & shift, middle + 1, lower)
+            upper = np.where(active & ~shift, middle, upper)
+            active = lower < upper
+
+        window = lower[:, np.newaxis] + np.arange(k)
+
+        return np.abs(points[window] - queries[:, np.newaxis]), self._order[window]
+
+
+class KDTree:
+    """
+    k-d дерево для поиска ближайших соседей в многомерном пространстве.
+
+    Пространство рекурсивно делится по медиане координаты с наибольшим
+    разбросом, пока в узле не останется не более leaf_size точек. Поиск
+    обходит сначала ближайшее поддерево и отсекает поддеревья, которые
+    не могут содержать точки ближе текущего k-го соседа.
+    """
+
+    def __init__(self, points: np.ndarray, leaf_size: int = 32) -> None:
+        """
+        Строит дерево.
+
+        Args:
+            points: массив точек формы (n, d).
+            leaf_size: максимальное число точек в листе. Значение по умолчанию - 32.
+        """
+        points = np.asarray(points, dtype=np.float64)
+
+        self._leaf_size = leaf_size
+        self._order = np.arange(points.shape[0])
+        self._points = points
+        # узел: (начало, конец, ось разбиения, значение разбиения, левый, правый)
+        self._nodes: list[tuple[int, int, int, float, int, int]] = []
+        self._build(0, points.shape[0])
+        self._points = points[self._order]
+
+    def __len__(self) -> int:
+        return self._points.shape[0]
+
+    def query(self, queries: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Находит k ближайших соседей для каждой точки запроса.
+
+        Args:
+            queries: массив точек запроса формы (m, d).
+            k: число соседей, не превосходящее размер дерева.
+
+        Returns:
+            Пару массивов формы (m, k): евклидовы расстояния до соседей
+            и их индексы в исходном массиве точек.
+        """
+        queries = np.asarray(queries, dtype=np.float64).reshape(-1, self._points.shape[1])
+        distances = np.empty((queries.shape[0], k))
+        indices = np.empty((queries.shape[0], k), dtype=np.intp)
+
+        for row, point in enumerate(queries):
+            heap: list[tuple[float, int]] = []
+            self._search(0, point, k, heap)
+            heap.sort(reverse=True)
+            distances[row] = [np.sqrt(-distance) for distance, _ in heap]
+            indices[row] = [self._order[index] for _, index in heap]
+
+        return distances, indices
+
+    def _build(self, start: int, end: int) -> int:
+        node_id = len(self._nodes)
+        self._nodes.append((start, end, -1, 0.0, -1, -1))
+
+        if end - start <= self._leaf_size:
+            return node_id
+
+        subset = self._points[self._order[start:end]]
+        axis = int(np.argmax(subset.max(axis=0) - subset.min(axis=0)))
+        middle = (end - start) // 2
+        partition = np.argpartition(subset[:, axis], middle)
+        self._order[start:end] = self._order[start:end][partition]
+        split = float(self._points[self._order[start + middle], axis])
+
+        left = self._build(start, start + middle)
+        right = self._build(start + middle, end)
+        self._nodes[node_id] = (start, end, axis, split, left, right)
+
+        return node_id
+
+    def _search(
+        self,
+        node_id: int,
+        point: np.ndarray,
+        k: int,
+        heap: list[tuple[float, int]],
+    ) -> None:
+        start, end, axis, split, left, right = self._nodes[node_id]
+
+        if axis < 0:
+            self._scan_leaf(start, end, point, k, heap)
+            return
+
+        offset = point[axis] - split
+        near, far = (left, right) if offset < 0 else (right, left)
+        self._search(near, point, k, heap)
+
+        # в куче хранятся квадраты расстояний со знаком минус
+        if len(heap) < k or offset * offset < -heap[0][0]:
+            self._search(far, point, k, heap)
+
+    def _scan_leaf(
+        self,
+        start: int,
+        end: int,
+        point: np.ndarray,
+        k: int,
+        heap: list[tuple[float, int]],
+    ) -> None:
+        differences = self._points[start:end] - point
+        squared = np.einsum("ij,ij->i", differences, differences)
+
+        for index, distance in zip(range(start, end), squared.tolist()):
+            if len(heap) < k:
+                heapq.heappush(heap, (-distance, index))
+            elif distance < -heap[0][0]:
+                heapq.heapreplace(heap, (-distance, index))
+
+
+def build_index(points: np.ndarray) -> Union[SortedIndex, KDTree]:
+    """
+    Строит индекс ближайших соседей, подходящий для размерности данных.
+
+    Args:
+        points: массив точек формы (n,) или (n, d).
+
+    Returns:
+        SortedIndex для одномерных данных и KDTree для многомерных.
+    """
+    points = np.asarray(points, dtype=np.float64)
+
+    if points.ndim == 1 or points.shape[1] == 1:
+        return SortedIndex(points)
+
+    return KDTree(points)
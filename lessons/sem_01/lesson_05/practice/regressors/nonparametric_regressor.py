@@ -1,14 +1,113 @@
-from typing import Sequence, Union
+from typing import Optional, Sequence, Union
 from numbers import Real
 
+import numpy as np
+
+from regressors.neighbours import KDTree, SortedIndex, build_index
 from regressors.regressor_abc import RegressorABC
 
 
 class NonparametricRegressor(RegressorABC):
+    """
+    Непараметрическая регрессия с ядром Епанечникова и адаптивной шириной окна.
+
+    Ширина окна для точки x - расстояние до ее k-го ближайшего соседа
+    из обучающей выборки. Точки дальше k-го соседа имеют нулевой вес, поэтому
+    предсказание вычисляется только по k ближайшим соседям, которые ищутся
+    с помощью индекса, построенного при обучении.
+    """
+
+    # Максимальное число элементов в промежуточных массивах формы (m, k)
+    _BLOCK_ELEMENTS = 1 << 22
+
+    def __init__(self, k_neighbours: int) -> None:
+        """
+        Инициализирует регрессор.
+
+        Args:
+            k_neighbours: номер соседа, расстояние до которого задает ширину окна.
+
+        Raises:
+            ValueError, если k_neighbours меньше 1.
+        """
+        if k_neighbours < 1:
+            raise ValueError(f"k_neighbours must be positive, got {k_neighbours}")
+
+        self._k_neighbours = int(k_neighbours)
+        self._index: Optional[Union[SortedIndex, KDTree]] = None
+        self._ordinates: Optional[np.ndarray] = None
+
     def fit(self, abscissa: Sequence[Real], ordinates: Sequence[Real]) -> None:
-        # ваш код
-        pass
+        """
+        Обучает регрессор, используя данные обучающей выборки.
+
+        Args:
+            abscissa: последовательность абсцисс точек или массив формы (n, d).
+            ordinates: последовательность ординат точек.
+
+        Raises:
+            ValueError, если длины abscissa и ordinates не совпадают или
+                точек в выборке меньше, чем k_neighbours.
+        """
+        abscissa = np.asarray(abscissa, dtype=np.float64)
+        ordinates = np.asarray(ordinates, dtype=np.float64).ravel()
+
+        if abscissa.shape[0] != ordinates.size:
+            raise ValueError(
+                f"abscissa and ordinates must have equal sizes, "
+                f"got {abscissa.shape[0]} and {ordinates.size}"
+            )
+
+        if ordinates.size < self._k_neighbours:
+            raise ValueError(
+                f"at least {self._k_neighbours} points are required, got {ordinates.size}"
+            )
+
+        self._index = build_index(abscissa)
+        self._ordinates = ordinates
+
+    def predict(self, abscissa: Union[Real, Sequence[Real]]) -> np.ndarray:
+        if self._index is None:
+            raise RuntimeError("regressor must be fitted before prediction")
+
+        queries = np.asarray(abscissa, dtype=np.float64)
+
+        if isinstance(self._index, SortedIndex):
+            queries = queries.ravel()
+        else:
+            queries = queries.reshape(-1, queries.shape[-1])
+
+        predictions = np.empty(queries.shape[0])
+        block = max(1, self._BLOCK_ELEMENTS // self._k_neighbours)
+
+        for start in range(0, queries.shape[0], block):
+            stop = start + block
+            predictions[start:stop] = self._predict_block(queries[start:stop])
+
+        return predictions
+
+    def _shared_arrays(self) -> dict[str, np.ndarray]:
+        if self._index is None:
+            return {}
+
+        return {
+            "_ordinates": self._ordinates,
+            "_index._points": self._index._points,
+            "_index._order": self._index._order,
+        }
+
+    def _predict_block(self, queries: np.ndarray) -> np.ndarray:
+        distances, indices = self._index.query(queries, self._k_neighbours)
+        bandwidth = distances.max(axis=1, keepdims=True)
+        scaled = distances / np.where(bandwidth > 0, bandwidth, 1.0)
+        weights = 0.75 * (1.0 - scaled * scaled)
+        np.maximum(weights, 0.0, out=weights)
+
+        # если все веса нулевые (например, k = 1 или все соседи совпадают
+        # с точкой запроса), используется среднее по соседям
+        total = weights.sum(axis=1, keepdims=True)
+        degenerate = (total == 0).ravel()
+        weights[degenerate] = 1.0
+        total[degenerate] = self._k_neighbours
 
-    def predict(self, abscissa: Union[Real, Sequence[Real]]) -> list:
-        # ваш код
-        return abscissa
+        return (weights * self._ordinates[indices]).sum(axis=1) / total.ravel()
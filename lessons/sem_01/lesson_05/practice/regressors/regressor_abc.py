@@ -1,14 +1,34 @@
 import abc
+import copy
+import os
+import pickle
 
-from typing import Sequence, Union
+from typing import TYPE_CHECKING, Any, Optional, Sequence, Union
 from numbers import Real
 
+import numpy as np
+
+# пул процессов и разделяемая память импортируются при первом параллельном
+# предсказании, чтобы не замедлять импорт регрессоров
+if TYPE_CHECKING:
+    from multiprocessing.shared_memory import SharedMemory
+
+
+# Имя файла с состоянием регрессора без массивов в каталоге сохраненной модели
+_STATE_FILE = "state.pkl"
+
+# Состояние процесса пула: регрессор, точки запроса и массив результатов
+_WORKER_STATE: dict[str, Any] = {}
+
 
 class RegressorABC(abc.ABC):
     """
     Интерфейс регрессора.
     """
 
+    # Минимальное число точек запроса в одной задаче пула процессов
+    _PARALLEL_CHUNK = 1 << 16
+
     @abc.abstractmethod
     def fit(self, abscissa: Sequence[Real], ordinates: Sequence[Real]) -> None:
         """
@@ -23,7 +43,7 @@ class RegressorABC(abc.ABC):
     @abc.abstractmethod
     def predict(
         self, abscissa: Union[Real, Sequence[Real]]
-    ) -> list[Real]:
+    ) -> np.ndarray:
         """
         Аппроксимирует значение функции в переданных точках.
 
@@ -32,9 +52,236 @@ class RegressorABC(abc.ABC):
                 в которых необходимо аппроксимировать значение функции.
 
         Returns:
-            Список аппроксимаций.
+            Одномерный массив аппроксимаций.
 
         Raises:
             RuntimeError, если predict вызван до вызова fit.
         """
         ...
+
+    def predict_parallel(
+        self,
+        abscissa: Union[Real, Sequence[Real]],
+        workers: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+    ) -> np.ndarray:
+        """
+        Аппроксимирует значение функции, распределяя точки по пулу процессов.
+
+        Точки запроса делятся на последовательные блоки, каждый из которых
+        обрабатывается методом predict в отдельном процессе. Массивы обученного
+        регрессора (см. _shared_arrays), точки запроса и результаты размещаются
+        в разделяемой памяти, поэтому в процессы пула регрессор передается
+        один раз без этих массивов, а задачи содержат только границы блоков.
+        Каждый блок записывается в свою часть результата, поэтому результат
+        не зависит от числа процессов и порядка выполнения задач.
+
+        Args:
+            abscissa: число - одна точка, или последовательность точек,
+                в которых необходимо аппроксимировать значение функции.
+            workers: число процессов. Значение по умолчанию - None,
+                число доступных процессоров.
+            chunk_size: число точек в одной задаче. Значение по умолчанию -
+                None, точки делятся поровну между процессами, но не меньше
+                _PARALLEL_CHUNK точек на задачу.
+
+        Returns:
+            Одномерный массив аппроксимаций.
+
+        Raises:
+            RuntimeError, если predict_parallel вызван до вызова fit.
+        """
+        from concurrent.futures import ProcessPoolExecutor
+
+        queries = np.ascontiguousarray(abscissa, dtype=np.float64)
+        queries = queries.reshape(-1) if queries.ndim < 2 else queries
+        workers = workers or os.cpu_count() or 1
+        size = queries.shape[0]
+        chunk_size = chunk_size or max(self._PARALLEL_CHUNK, -(-size // workers))
+
+        if workers == 1 or size <= chunk_size:
+            return self.predict(queries)
+
+        blocks: list["SharedMemory"] = []
+
+        try:
+            shell = self
+            shared = {}
+
+            for path, array in self._shared_arrays().items():
+                if array is None:
+                    continue
+
+                shared[path] = _share(np.ascontiguousarray(array), blocks)
+                shell = _replace_attribute(shell, path, None)
+
+            queries_spec = _share(queries, blocks)
+            result_spec = _share(np.empty(size), blocks)
+            result = np.ndarray((size,), np.float64, buffer=blocks[-1].buf)
+
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(shell, shared, queries_spec, result_spec),
+            ) as pool:
+                starts = range(0, size, chunk_size)
+                stops = [min(start + chunk_size, size) for start in starts]
+                list(pool.map(_predict_chunk, starts, stops))
+
+            predictions = result.copy()
+            del result
+
+            return predictions
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
+
+    def save(self, path: Union[str, os.PathLike]) -> None:
+        """
+        Сохраняет регрессор в каталог.
+
+        Массивы обученного регрессора (см. _shared_arrays) записываются
+        в отдельные файлы .npy, остальное состояние - в файл state.pkl,
+        который записывается последним, поэтому каталог без него содержит
+        незавершенное сохранение.
+
+        Args:
+            path: путь к каталогу. Каталог создается, если не существует,
+                файлы предыдущего сохранения перезаписываются.
+        """
+        os.makedirs(path, exist_ok=True)
+        shell = self
+        arrays = []
+
+        for name, array in self._shared_arrays().items():
+            if array is None:
+                continue
+
+            np.save(os.path.join(path, f"{name}.npy"), array, allow_pickle=False)
+            shell = _replace_attribute(shell, name, None)
+            arrays.append(name)
+
+        temporary = os.path.join(path, f"{_STATE_FILE}.tmp")
+
+        with open(temporary, "wb") as file:
+            pickle.dump((shell, arrays), file, protocol=pickle.HIGHEST_PROTOCOL)
+
+        os.replace(temporary, os.path.join(path, _STATE_FILE))
+
+    @classmethod
+    def load(cls, path: Union[str, os.PathLike], mmap: bool = True) -> "RegressorABC":
+        """
+        Загружает регрессор, сохраненный методом save.
+
+        По умолчанию массивы не читаются в память, а отображаются из файлов
+        .npy только для чтения: загрузка не зависит от размера обучающей
+        выборки, а страницы файлов подгружаются при первом обращении
+        и разделяются между процессами, загрузившими одну модель.
+        Состояние восстанавливается через pickle, поэтому загружать
+        можно только модели из доверенных источников.
+
+        Args:
+            path: путь к каталогу с сохраненной моделью.
+            mmap: отображать ли массивы в память. Значение по умолчанию - True,
+                иначе массивы читаются целиком и доступны для записи.
+
+        Returns:
+            Загруженный регрессор.
+
+        Raises:
+            FileNotFoundError, если в каталоге нет сохраненной модели.
+            TypeError, если сохранен регрессор другого класса.
+        """
+        with open(os.path.join(path, _STATE_FILE), "rb") as file:
+            regressor, arrays = pickle.load(file)
+
+        if not isinstance(regressor, cls):
+            raise TypeError(
+                f"saved regressor is {type(regressor).__name__}, not {cls.__name__}"
+            )
+
+        for name in arrays:
+            array = np.load(
+                os.path.join(path, f"{name}.npy"),
+                mmap_mode="r" if mmap else None,
+                allow_pickle=False,
+            )
+            regressor = _replace_attribute(regressor, name, array)
+
+        return regressor
+
+    def _shared_arrays(self) -> dict[str, np.ndarray]:
+        """
+        Возвращает массивы обученного регрессора для разделяемой памяти
+        и сохранения в отдельные файлы.
+
+        Ключи - пути к атрибутам через точку, например "_index._points",
+        значения None (у необученного регрессора) пропускаются. Регрессоры
+        с большими обученными массивами переопределяют этот метод.
+        """
+        return {}
+
+
+def _replace_attribute(obj: Any, path: str, value: Any) -> Any:
+    """
+    Возвращает поверхностную копию obj, в которой атрибут по пути path заменен.
+
+    Объекты на пути к атрибуту также копируются, исходный объект не изменяется.
+    """
+    head, _, rest = path.partition(".")
+    clone = copy.copy(obj)
+    setattr(clone, head, _replace_attribute(getattr(obj, head), rest, value) if rest else value)
+
+    return clone
+
+
+def _share(array: np.ndarray, blocks: list["SharedMemory"]) -> tuple[str, tuple, str]:
+    """Копирует массив в новый блок разделяемой памяти и возвращает его описание."""
+    from multiprocessing.shared_memory import SharedMemory
+
+    block = SharedMemory(create=True, size=max(1, array.nbytes))
+    blocks.append(block)
+    np.ndarray(array.shape, array.dtype, buffer=block.buf)[...] = array
+
+    return block.name, array.shape, array.dtype.str
+
+
+def _attach(spec: tuple[str, tuple, str]) -> tuple[np.ndarray, "SharedMemory"]:
+    """Подключается к блоку разделяемой памяти и возвращает массив поверх него."""
+    from multiprocessing.shared_memory import SharedMemory
+
+    name, shape, dtype = spec
+    block = SharedMemory(name=name)
+
+    return np.ndarray(shape, np.dtype(dtype), buffer=block.buf), block
+
+
+def _init_worker(
+    shell: RegressorABC,
+    shared: dict[str, tuple[str, tuple, str]],
+    queries_spec: tuple[str, tuple, str],
+    result_spec: tuple[str, tuple, str],
+) -> None:
+    """Восстанавливает регрессор в процессе пула поверх разделяемой памяти."""
+    blocks = []
+
+    for path, spec in shared.items():
+        array, block = _attach(spec)
+        array.flags.writeable = False
+        shell = _replace_attribute(shell, path, array)
+        blocks.append(block)
+
+    queries, queries_block = _attach(queries_spec)
+    result, result_block = _attach(result_spec)
+    blocks.extend([queries_block, result_block])
+
+    _WORKER_STATE.update(
+        regressor=shell, queries=queries, result=result, blocks=blocks
+    )
+
+
+def _predict_chunk(start: int, stop: int) -> None:
+    """Вычисляет предсказания для блока точек и записывает их в результат."""
+    regressor: RegressorABC = _WORKER_STATE["regressor"]
+    _WORKER_STATE["result"][start:stop] = regressor.predict(_WORKER_STATE["queries"][start:stop])